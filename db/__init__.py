@@ -10,6 +10,7 @@ from db.db_operations import (
     get_url_parser_by_id,
     get_url_parser_by_name,
     find_parser_for_url,
+    invalidate_parser_cache,
     create_url_parser,
     update_url_parser,
     delete_url_parser
@@ -5,13 +5,15 @@ This module provides a robust database client that handles detached objects prop
 and provides a clean interface for database operations.
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union, Generic
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Type, TypeVar, Union, Generic
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker, Session, scoped_session
+from sqlalchemy import create_engine, insert, inspect, select, update
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
@@ -23,6 +25,21 @@ logger = logging.getLogger(__name__)
 # Type variable for generic type hints
 T = TypeVar('T', bound=Base)
 
+
+@lru_cache(maxsize=None)
+def _column_keys(model_class: Type[T]) -> FrozenSet[str]:
+    """
+    Get the column attribute names of a model class.
+    
+    Args:
+        model_class: SQLAlchemy model class
+        
+    Returns:
+        Names of the mapped column attributes
+    """
+    return frozenset(c.key for c in inspect(model_class).column_attrs)
+
+
 class DBClient:
     """
     Database client for LLM Spider.
@@ -39,8 +56,13 @@ class DBClient:
             engine: SQLAlchemy engine to use. If None, the default engine from models.py is used.
         """
         self.engine = engine or get_engine()
+        # Each operation gets its own short-lived session, so sessions are never
+        # shared between threads and no thread-local registry is needed
         self.session_factory = sessionmaker(bind=self.engine)
-        self.scoped_session = scoped_session(self.session_factory)
+        # Session of the unit of work active in the current context, if any
+        self._unit_of_work_session: ContextVar[Optional[Session]] = ContextVar(
+            f"db_client_unit_of_work_{id(self)}", default=None
+        )
     
     @contextmanager
     def session_scope(self) -> Session:
@@ -53,9 +75,15 @@ class DBClient:
                 results = session.query(Model).all()
         
         The session will be automatically committed on success and
-        rolled back on exception.
+        rolled back on exception. Inside unit_of_work() the unit of work's
+        session is used instead, and committing is left to the unit of work.
         """
-        session = self.scoped_session()
+        session = self._unit_of_work_session.get()
+        if session is not None:
+            yield session
+            return
+        
+        session = self.session_factory()
         try:
             yield session
             session.commit()
@@ -64,54 +92,63 @@ class DBClient:
             logger.error(f"Database error: {str(e)}")
             raise
         finally:
-            self.scoped_session.remove()
+            session.close()
     
-    def _to_dict(self, obj: T) -> Dict[str, Any]:
+    @contextmanager
+    def unit_of_work(self) -> Session:
         """
-        Convert a SQLAlchemy model instance to a dictionary.
+        Context manager that runs several operations in one transaction.
+        
+        Usage:
+            with db_client.unit_of_work():
+                parsers = db_client.get_all(URLParser)
+                db_client.create(new_parser)
+        
+        Every DBClient call made in the block shares one session, which is
+        committed once at the end, or rolled back if the block raises.
+        Nested units of work join the outermost one.
+        """
+        session = self._unit_of_work_session.get()
+        if session is not None:
+            yield session
+            return
+        
+        with self.session_scope() as session:
+            token = self._unit_of_work_session.set(session)
+            try:
+                yield session
+            finally:
+                self._unit_of_work_session.reset(token)
+    
+    def in_unit_of_work(self) -> bool:
+        """
+        Check whether a unit of work is active in the current context.
         
-        Args:
-            obj: SQLAlchemy model instance
-            
         Returns:
-            Dictionary representation of the model instance
+            True if DBClient calls made now join an uncommitted unit of work
         """
-        if obj is None:
-            return None
-            
-        result = {}
-        for c in inspect(obj).mapper.column_attrs:
-            value = getattr(obj, c.key)
-            # Handle JSON fields
-            if c.key in ('meta_data', 'chat_data') and value is not None:
-                if isinstance(value, str):
-                    try:
-                        value = json.loads(value)
-                    except json.JSONDecodeError:
-                        pass
-            result[c.key] = value
-        return result
-    
-    def _from_dict(self, model_class: Type[T], data: Dict[str, Any]) -> T:
-        """
-        Create a SQLAlchemy model instance from a dictionary.
+        return self._unit_of_work_session.get() is not None
+    
+    def _detach(self, session: Session, obj: T) -> T:
+        """
+        Detach a model instance from its session so it can be used after the
+        session is closed.
+        
+        Column attributes that are not loaded yet (such as server-generated
+        timestamps after a flush) are loaded first.
         
         Args:
-            model_class: SQLAlchemy model class
-            data: Dictionary of attributes
+            session: Session the instance belongs to
+            obj: SQLAlchemy model instance
             
         Returns:
-            SQLAlchemy model instance
+            The same instance, detached from the session
         """
-        if data is None:
-            return None
-            
-        # Handle JSON fields
-        for key in ('meta_data', 'chat_data'):
-            if key in data and data[key] is not None and not isinstance(data[key], str):
-                data[key] = json.dumps(data[key])
-                
-        return model_class(**data)
+        unloaded = inspect(obj).unloaded & _column_keys(type(obj))
+        if unloaded:
+            session.refresh(obj, attribute_names=list(unloaded))
+        session.expunge(obj)
+        return obj
     
     def create(self, obj: T) -> T:
         """
@@ -126,9 +163,48 @@ class DBClient:
         with self.session_scope() as session:
             session.add(obj)
             session.flush()
-            # Convert to dictionary to detach from session
-            obj_dict = self._to_dict(obj)
-            return self._from_dict(obj.__class__, obj_dict)
+            return self._detach(session, obj)
+    
+    def create_many(self, objs: List[T]) -> List[T]:
+        """
+        Create several records in a single transaction.
+        
+        The rows are flushed together, which SQLAlchemy sends as batched
+        INSERT statements instead of one statement per record.
+        
+        Args:
+            objs: SQLAlchemy model instances to create
+            
+        Returns:
+            The created records with their IDs populated, in the same order
+        """
+        if not objs:
+            return []
+        with self.session_scope() as session:
+            session.add_all(objs)
+            session.flush()
+            return [self._detach(session, obj) for obj in objs]
+    
+    def insert_many(self, model_class: Type[T], rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert several records from plain dictionaries.
+        
+        No model instances are built: the rows are passed to a single bulk
+        INSERT, which SQLAlchemy sends as multi-row INSERT statements. Use
+        create_many() when the created records are needed.
+        
+        Args:
+            model_class: SQLAlchemy model class
+            rows: Column values of each record to insert
+            
+        Returns:
+            Number of records inserted
+        """
+        if not rows:
+            return 0
+        with self.session_scope() as session:
+            session.execute(insert(model_class), rows)
+            return len(rows)
     
     def get_by_id(self, model_class: Type[T], record_id: int) -> Optional[T]:
         """
@@ -142,11 +218,9 @@ class DBClient:
             The record if found, None otherwise
         """
         with self.session_scope() as session:
-            obj = session.query(model_class).filter(model_class.id == record_id).first()
+            obj = session.get(model_class, record_id)
             if obj:
-                # Convert to dictionary to detach from session
-                obj_dict = self._to_dict(obj)
-                return self._from_dict(model_class, obj_dict)
+                return self._detach(session, obj)
             return None
     
     def get_all(self, model_class: Type[T]) -> List[T]:
@@ -161,8 +235,28 @@ class DBClient:
         """
         with self.session_scope() as session:
             objs = session.query(model_class).all()
-            # Convert each object to dictionary to detach from session
-            return [self._from_dict(model_class, self._to_dict(obj)) for obj in objs]
+            return [self._detach(session, obj) for obj in objs]
+    
+    def get_all_mappings(self, model_class: Type[T], order_by=None) -> List[RowMapping]:
+        """
+        Get all records of a model as plain mappings instead of model instances.
+        
+        Rows are fetched through Core in batches, so no ORM instances are
+        built. Each mapping is keyed by column name (row["url_pattern"]),
+        and JSON columns are decoded.
+        
+        Args:
+            model_class: SQLAlchemy model class
+            order_by: Optional column or expression to order by
+            
+        Returns:
+            List of read-only mappings, one per record
+        """
+        with self.session_scope() as session:
+            statement = select(*model_class.__table__.columns).execution_options(yield_per=500)
+            if order_by is not None:
+                statement = statement.order_by(order_by)
+            return session.execute(statement).mappings().all()
     
     def update(self, model_class: Type[T], record_id: int, **kwargs) -> Optional[T]:
         """
@@ -175,21 +269,33 @@ class DBClient:
             
         Returns:
             The updated record if found, None otherwise
+            
+        Raises:
+            ValueError: If a field is not a column of the model
         """
+        unknown = kwargs.keys() - _column_keys(model_class)
+        if unknown:
+            raise ValueError(
+                f"Unknown fields for {model_class.__name__}: {', '.join(sorted(unknown))}"
+            )
         with self.session_scope() as session:
-            obj = session.query(model_class).filter(model_class.id == record_id).first()
+            if kwargs and self.engine.dialect.update_returning:
+                # One UPDATE ... RETURNING statement, without loading the record first
+                statement = (
+                    update(model_class)
+                    .where(model_class.id == record_id)
+                    .values(**kwargs)
+                    .returning(model_class)
+                )
+                obj = session.execute(statement).scalar_one_or_none()
+            else:
+                obj = session.get(model_class, record_id)
+                if obj:
+                    for key, value in kwargs.items():
+                        setattr(obj, key, value)
+                    session.flush()
             if obj:
-                # Handle JSON fields
-                for key in ('meta_data', 'chat_data'):
-                    if key in kwargs and kwargs[key] is not None and not isinstance(kwargs[key], str):
-                        kwargs[key] = json.dumps(kwargs[key])
-                
-                for key, value in kwargs.items():
-                    setattr(obj, key, value)
-                session.flush()
-                # Convert to dictionary to detach from session
-                obj_dict = self._to_dict(obj)
-                return self._from_dict(model_class, obj_dict)
+                return self._detach(session, obj)
             return None
     
     def delete(self, model_class: Type[T], record_id: int) -> bool:
@@ -204,12 +310,53 @@ class DBClient:
             True if deleted, False if not found
         """
         with self.session_scope() as session:
-            obj = session.query(model_class).filter(model_class.id == record_id).first()
+            obj = session.get(model_class, record_id)
             if obj:
                 session.delete(obj)
                 return True
             return False
     
+    def get_one(self, model_class: Type[T], **filters) -> Optional[T]:
+        """
+        Get a single record matching field filters.
+        
+        Only one row is fetched (LIMIT 1), which makes this the cheap way to
+        look up a record by a unique field.
+        
+        Args:
+            model_class: SQLAlchemy model class
+            **filters: Field filters (field_name=value)
+            
+        Returns:
+            The first matching record if found, None otherwise
+        """
+        with self.session_scope() as session:
+            obj = session.query(model_class).filter_by(**filters).first()
+            if obj:
+                return self._detach(session, obj)
+            return None
+    
+    def get_rows(self, *columns, criteria=(), order_by=None) -> List[Row]:
+        """
+        Get plain rows for a set of columns without loading model instances.
+        
+        Rows are lightweight named tuples that support attribute access
+        (row.name) and are not bound to a session.
+        
+        Args:
+            *columns: Columns to select, e.g. URLParser.id, URLParser.name
+            criteria: Optional SQLAlchemy filter expressions
+            order_by: Optional column or expression to order by
+            
+        Returns:
+            List of rows
+        """
+        with self.session_scope() as session:
+            statement = select(*columns).where(*criteria)
+            if order_by is not None:
+                statement = statement.order_by(order_by)
+            return session.execute(statement).all()
+    
     def query(self, model_class: Type[T], **filters) -> List[T]:
         """
         Query records with filters.
@@ -226,8 +373,7 @@ class DBClient:
             for field, value in filters.items():
                 query = query.filter(getattr(model_class, field) == value)
             objs = query.all()
-            # Convert each object to dictionary to detach from session
-            return [self._from_dict(model_class, self._to_dict(obj)) for obj in objs]
+            return [self._detach(session, obj) for obj in objs]
     
     def execute_raw_query(self, query_string: str, **params) -> List[Dict[str, Any]]:
         """
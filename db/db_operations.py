@@ -5,25 +5,143 @@ This module provides utility functions for common database operations
 using the DBClient.
 """
 
-import re
+import copy
 import logging
-from typing import List, Optional, Dict, Any, Union
+from itertools import chain
+from typing import List, Optional, Dict, Any, Mapping, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
 
 from db.models import URLParser
 from db.db_client import db_client
+from utils.url_matcher import URLMatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# URL parsers cached in memory: the column values of all parsers in ID order
+# and of parsers looked up by ID, and a matcher from URL patterns to parser
+# IDs. Everything is loaded on first use outside a unit of work and dropped
+# whenever a transaction that wrote URL parsers through a DBClient session ends.
+# Callers get new URLParser objects built from the cached values, so changing
+# them never changes the cache
+_all_parsers: Optional[Tuple[Mapping[str, Any], ...]] = None
+_parsers_by_id: Dict[int, Mapping[str, Any]] = {}
+_parser_matcher: Optional[URLMatcher] = None
+
+# Column attribute names of URLParser
+_PARSER_COLUMNS = tuple(column.key for column in URLParser.__table__.columns)
+
+# Session.info key marking sessions that wrote URL parsers
+_PARSERS_CHANGED = "url_parsers_changed"
+
+def invalidate_parser_cache(*args) -> None:
+    """
+    Drop the cached URL parsers so the next lookup reloads them.
+    
+    This runs automatically when a transaction that wrote URL parsers through
+    a DBClient session is committed or rolled back, including bulk
+    INSERT/UPDATE/DELETE statements; call it after changing the url_parser
+    table with raw SQL.
+    """
+    global _all_parsers, _parser_matcher
+    _all_parsers = None
+    _parsers_by_id.clear()
+    _parser_matcher = None
+
+def _mark_on_flush(session, flush_context) -> None:
+    """Mark a session whose flush writes URL parsers."""
+    if any(isinstance(obj, URLParser) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_PARSERS_CHANGED] = True
+
+def _mark_on_bulk_write(orm_execute_state) -> None:
+    """Mark a session running a bulk write to the url_parser table."""
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is URLParser and (
+        orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[_PARSERS_CHANGED] = True
+
+def _invalidate_on_transaction_end(session, transaction) -> None:
+    """Drop the cached URL parsers once a transaction that wrote them is committed or rolled back."""
+    if transaction.parent is None and session.info.pop(_PARSERS_CHANGED, False):
+        invalidate_parser_cache()
+
+event.listen(db_client.session_factory, 'after_flush', _mark_on_flush)
+# Bulk statements don't go through the flush
+event.listen(db_client.session_factory, 'do_orm_execute', _mark_on_bulk_write)
+event.listen(db_client.session_factory, 'after_transaction_end', _invalidate_on_transaction_end)
+
+def _use_cache() -> bool:
+    """
+    Check whether the cached URL parsers may be used.
+    
+    Inside a unit of work the parsers are read from its session instead, so
+    its uncommitted writes are seen but never cached.
+    """
+    return not db_client.in_unit_of_work()
+
+def _to_parser(row: Mapping[str, Any]) -> URLParser:
+    """
+    Build a detached URLParser from cached column values.
+    
+    The JSON column values are copied, so the parser can be changed freely.
+    """
+    parser = URLParser(**{
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in row.items()
+    })
+    make_transient_to_detached(parser)
+    return parser
+
+def _get_all_parsers() -> Tuple[Mapping[str, Any], ...]:
+    """
+    Get the column values of all URL parsers, loading them if needed.
+    
+    Returns:
+        Tuple of read-only mappings in ID order
+    """
+    global _all_parsers
+    use_cache = _use_cache()
+    rows = _all_parsers if use_cache else None
+    if rows is None:
+        rows = tuple(db_client.get_all_mappings(URLParser, order_by=URLParser.id))
+        if use_cache:
+            _all_parsers = rows
+    return rows
+
+def _get_parser_matcher() -> URLMatcher:
+    """
+    Get the matcher over all URL parsers, building it if needed.
+    
+    Only the IDs and URL patterns are read, as plain rows.
+    
+    Returns:
+        URLMatcher keyed by parser ID, in ID order
+    """
+    global _parser_matcher
+    use_cache = _use_cache()
+    matcher = _parser_matcher if use_cache else None
+    if matcher is None:
+        rows = db_client.get_all_mappings(URLParser, order_by=URLParser.id)
+        matcher = URLMatcher(((row["id"], row["url_pattern"]) for row in rows), anchored=True)
+        if use_cache:
+            _parser_matcher = matcher
+    return matcher
+
 def get_all_url_parsers() -> List[URLParser]:
     """
     Get all URL parsers from the database.
     
+    The parsers are cached in memory until a URL parser changes. Each call
+    returns new detached objects, so callers may change them.
+    
     Returns:
-        List of URLParser objects
+        List of URLParser objects, in ID order
     """
     try:
-        return db_client.get_all(URLParser)
+        return [_to_parser(row) for row in _get_all_parsers()]
     except Exception as e:
         logger.error(f"Error getting all URL parsers: {str(e)}")
         return []
@@ -32,6 +150,9 @@ def get_url_parser_by_id(parser_id: int) -> Optional[URLParser]:
     """
     Get a URL parser by its ID.
     
+    Parsers that were found are cached in memory until a URL parser changes.
+    Each call returns a new detached object, so callers may change it.
+    
     Args:
         parser_id: ID of the parser to retrieve
         
@@ -39,7 +160,16 @@ def get_url_parser_by_id(parser_id: int) -> Optional[URLParser]:
         URLParser object if found, None otherwise
     """
     try:
-        return db_client.get_by_id(URLParser, parser_id)
+        use_cache = _use_cache()
+        row = _parsers_by_id.get(parser_id) if use_cache else None
+        if row is None:
+            parser = db_client.get_by_id(URLParser, parser_id)
+            if parser is None:
+                return None
+            row = {key: getattr(parser, key) for key in _PARSER_COLUMNS}
+            if use_cache:
+                _parsers_by_id[parser_id] = row
+        return _to_parser(row)
     except Exception as e:
         logger.error(f"Error getting URL parser with ID {parser_id}: {str(e)}")
         return None
@@ -55,8 +185,7 @@ def get_url_parser_by_name(name: str) -> Optional[URLParser]:
         URLParser object if found, None otherwise
     """
     try:
-        parsers = db_client.query(URLParser, name=name)
-        return parsers[0] if parsers else None
+        return db_client.get_one(URLParser, name=name)
     except Exception as e:
         logger.error(f"Error getting URL parser with name '{name}': {str(e)}")
         return None
@@ -65,6 +194,10 @@ def find_parser_for_url(url: str) -> Optional[URLParser]:
     """
     Find a parser that matches the given URL.
     
+    Parsers are loaded and their patterns compiled once, then matched from
+    memory until a URL parser changes. Patterns are matched at the start of
+    the URL (re.match), and the parser with the lowest ID wins.
+    
     Args:
         url: URL to find a parser for
         
@@ -72,11 +205,8 @@ def find_parser_for_url(url: str) -> Optional[URLParser]:
         URLParser object if a matching parser is found, None otherwise
     """
     try:
-        parsers = db_client.get_all(URLParser)
-        for parser in parsers:
-            if re.match(parser.url_pattern, url):
-                return parser
-        return None
+        parser_id = _get_parser_matcher().match(url)
+        return get_url_parser_by_id(parser_id) if parser_id is not None else None
     except Exception as e:
         logger.error(f"Error finding parser for URL '{url}': {str(e)}")
         return None
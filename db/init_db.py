@@ -32,45 +32,46 @@ def add_initial_url_parsers():
     """Add initial URL parsers to the database."""
     print("Adding initial URL parsers...")
     
-    # Check if parsers already exist
-    existing_parsers = db_client.get_all(URLParser)
-    if existing_parsers:
-        print(f"Found {len(existing_parsers)} existing parsers. Skipping initialization.")
-        return
+    # Check for existing parsers and add the new ones in one transaction
+    with db_client.unit_of_work():
+        # Only the IDs are needed, so the JSON columns are not loaded
+        existing_parsers = db_client.get_rows(URLParser.id)
+        if existing_parsers:
+            print(f"Found {len(existing_parsers)} existing parsers. Skipping initialization.")
+            return
     
-    # GitHub repository parser
-    github_repo_parser = URLParser(
-        name="GitHub Repository",
-        url_pattern=r"https://github\.com/([^/]+)/([^/]+)/?$",
-        parser="github_repo_parser",
-        meta_data={
-            "site": "github.com",
-            "type": "repository"
-        },
-        chat_data={
-            "system_prompt": "You are analyzing a GitHub repository.",
-            "user_prompt_template": "Please summarize this GitHub repository: {url}"
-        }
-    )
+        # GitHub repository parser
+        github_repo_parser = dict(
+            name="GitHub Repository",
+            url_pattern=r"https://github\.com/([^/]+)/([^/]+)/?$",
+            parser="github_repo_parser",
+            meta_data={
+                "site": "github.com",
+                "type": "repository"
+            },
+            chat_data={
+                "system_prompt": "You are analyzing a GitHub repository.",
+                "user_prompt_template": "Please summarize this GitHub repository: {url}"
+            }
+        )
     
-    # Medium article parser
-    medium_article_parser = URLParser(
-        name="Medium Article",
-        url_pattern=r"https://medium\.com/.*",
-        parser="medium_article_parser",
-        meta_data={
-            "site": "medium.com",
-            "type": "article"
-        },
-        chat_data={
-            "system_prompt": "You are analyzing a Medium article.",
-            "user_prompt_template": "Please summarize this Medium article: {url}"
-        }
-    )
+        # Medium article parser
+        medium_article_parser = dict(
+            name="Medium Article",
+            url_pattern=r"https://medium\.com/.*",
+            parser="medium_article_parser",
+            meta_data={
+                "site": "medium.com",
+                "type": "article"
+            },
+            chat_data={
+                "system_prompt": "You are analyzing a Medium article.",
+                "user_prompt_template": "Please summarize this Medium article: {url}"
+            }
+        )
     
-    # Add parsers to the database
-    db_client.create(github_repo_parser)
-    db_client.create(medium_article_parser)
+        # Add parsers to the database in one bulk INSERT
+        db_client.insert_many(URLParser, [github_repo_parser, medium_article_parser])
     
     print("Initial URL parsers added.")
 
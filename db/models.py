@@ -2,12 +2,19 @@
 Database models for the LLM Spider application.
 """
 
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, create_engine
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, create_engine, event, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import os
+import threading
 from dotenv import load_dotenv
 
+# Use orjson for the JSON columns when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -43,10 +50,123 @@ class URLParser(Base):
         return f"<URLParser(name='{self.name}', url_pattern='{self.url_pattern}')>"
 
 
+# Pragmas applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """
+    Configure a new SQLite connection.
+    
+    Enables WAL journaling with relaxed syncing, keeps temporary tables in
+    memory and memory-maps the database file.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _orjson_dumps(value):
+    """Serialize a JSON column value with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+# Serializers used by the JSON columns (meta_data, chat_data)
+JSON_OPTIONS = (
+    {"json_serializer": _orjson_dumps, "json_deserializer": orjson.loads}
+    if orjson is not None else {}
+)
+
+# Number of compiled SQL statements cached per engine (SQLAlchemy's default is 500)
+QUERY_CACHE_SIZE = 1200
+
+# Connection pool settings for file-backed SQLite and server databases
+POOL_OPTIONS = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_timeout": 30,
+}
+
+# Extra pool settings for server databases, whose connections can go stale
+SERVER_POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+
 # Function to get the database engine
 def get_engine():
     """
-    Create and return a SQLAlchemy engine using the DATABASE_URL from environment variables.
+    Return the SQLAlchemy engine for the DATABASE_URL from environment variables.
+    
+    One engine is created per database URL and shared by every caller, so the
+    whole process uses a single connection pool and compiled statement cache.
+    """
+    return _create_engine(os.getenv('DATABASE_URL', 'sqlite:///db/llm_spider.db'))
+
+
+def reset_engine():
+    """Dispose of the shared engines so the next get_engine() call creates a new one."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+# Engines created by get_engine, keyed by database URL
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _create_engine(database_url):
+    """Return the engine for a database URL, creating it on first use."""
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = _build_engine(database_url)
+            _engines[database_url] = engine
+        return engine
+
+
+def _build_engine(database_url):
+    """
+    Create a new engine for a database URL.
+    
+    For SQLite databases every connection is tuned with SQLITE_PRAGMAS.
+    check_same_thread is disabled so pooled connections can be used from
+    worker threads as well as the GUI thread.
+    
+    The compiled statement cache is enlarged to QUERY_CACHE_SIZE, the
+    connection pool is sized with POOL_OPTIONS and JSON columns are encoded
+    and decoded with orjson when it is installed. In-memory SQLite databases
+    keep SQLAlchemy's default single connection pool, since each connection
+    would otherwise see its own empty database.
     """
-    database_url = os.getenv('DATABASE_URL', 'sqlite:///db/llm_spider.db')
-    return create_engine(database_url) 
\ No newline at end of file
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        pool_options = {} if url.database in (None, '', ':memory:') else POOL_OPTIONS
+        engine = create_engine(
+            url,
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args={"check_same_thread": False},
+            **pool_options,
+            **JSON_OPTIONS
+        )
+        event.listen(engine, 'connect', _configure_sqlite_connection)
+    else:
+        engine = create_engine(
+            url,
+            query_cache_size=QUERY_CACHE_SIZE,
+            **POOL_OPTIONS,
+            **SERVER_POOL_OPTIONS,
+            **JSON_OPTIONS
+        )
+    return engine 
\ No newline at end of file
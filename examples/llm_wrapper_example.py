@@ -118,11 +118,15 @@ def main():
                 enable_functions=True  # Enable function calling for this request
             )
             
-            # Process the stream
+            # Process the stream: text chunks are written as they arrive and the
+            # final LLMResponse ends the stream
             final_response = None
+            out_write = sys.stdout.write
+            out_flush = sys.stdout.flush
             for chunk in response_stream:
                 if isinstance(chunk, str):
-                    print(chunk, end="", flush=True)
+                    out_write(chunk)
+                    out_flush()
                 else:
                     final_response = chunk
             
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Spider - LLM Package
+
+This package provides the LLM client, wrapper, worker and function calling support.
+Logging for all modules of the package is configured once, on the package logger.
+"""
+
+import logging
+
+
+def configure_logging(level: int = logging.INFO) -> logging.Logger:
+    """Configure the logger shared by all modules of the llm package.
+    
+    The package logger gets the given level, and a console handler only if
+    neither it nor the root logger has handlers yet, so applications that
+    configure logging themselves don't get duplicate lines.
+    
+    Args:
+        level: The logging level of the package logger
+        
+    Returns:
+        The package logger
+    """
+    package_logger = logging.getLogger(__name__)
+    package_logger.setLevel(level)
+    
+    if not package_logger.handlers and not logging.getLogger().handlers:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        console_handler.setFormatter(formatter)
+        package_logger.addHandler(console_handler)
+    
+    return package_logger
+
+
+configure_logging()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Spider - LLM Response Cache
+
+This module provides an in-memory cache of LLM responses, keyed on the
+request parameters, so repeated identical calls don't go to the provider.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from llm.llm_client import LLMResponse
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Request parameters that determine the response
+KEY_PARAMS = ("model", "messages", "tools", "temperature", "max_tokens", "response_format")
+
+
+class LLMCache:
+    """
+    Exact-match cache of LLM responses with least-recently-used eviction.
+
+    Responses are cached under a SHA-256 hash of the request parameters that
+    determine them. Only deterministic requests, with a temperature of 0, are
+    cached, since replaying a sampled answer would hide the variation the
+    caller asked for.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached responses
+            ttl: Optional number of seconds after which a cached response expires
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheable(params: Dict[str, Any]) -> bool:
+        """Check whether the response of a request may be cached.
+        
+        Args:
+            params: The parameters sent to litellm
+            
+        Returns:
+            True if the request is deterministic, i.e. has a temperature of 0
+        """
+        return params.get("temperature") == 0
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Compute the cache key of a request.
+
+        Args:
+            params: The parameters sent to litellm
+
+        Returns:
+            The hex digest of the parameters that determine the response
+        """
+        key_params = {name: params.get(name) for name in KEY_PARAMS}
+        data = json.dumps(key_params, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional["LLMResponse"]:
+        """Get the cached response of a request.
+
+        Args:
+            params: The parameters sent to litellm
+
+        Returns:
+            A copy of the cached response, or None if there is none
+        """
+        key = self.make_key(params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        logger.info(f"LLM cache hit for model {params.get('model')}")
+        return copy.deepcopy(entry[1])
+
+    def set(self, params: Dict[str, Any], response: "LLMResponse") -> None:
+        """Cache the response of a request.
+
+        Args:
+            params: The parameters sent to litellm
+            response: The response received from the LLM
+        """
+        key = self.make_key(params)
+        entry = (time.monotonic(), copy.deepcopy(response))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
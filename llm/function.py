@@ -9,7 +9,7 @@ Now using Pydantic for validation and schema generation.
 """
 
 import logging
-from typing import Dict, Any, ClassVar, Type, Optional, get_type_hints
+from typing import Dict, Any, Callable, ClassVar, Type, Optional, get_type_hints
 from abc import ABC, abstractmethod
 from pydantic import BaseModel, Field, create_model
 
@@ -20,6 +20,10 @@ logger = logging.getLogger(__name__)
 class Function(ABC):
     """Base class for all functions that can be called by an LLM."""
     
+    # Instances only hold their context; subclasses declare empty __slots__ so
+    # that instances don't carry a __dict__
+    __slots__ = ("context",)
+    
     # Class variables to be overridden by subclasses
     name: ClassVar[str] = ""
     description: ClassVar[str] = ""
@@ -27,39 +31,98 @@ class Function(ABC):
     # Define the input model as a class variable to be overridden by subclasses
     InputModel: ClassVar[Type[BaseModel]] = None
     
+    # Set to True when the function keeps no state between calls besides its
+    # context, so the FunctionManager can reuse one instance for every call
+    stateless: ClassVar[bool] = False
+    
     def __init__(self, **kwargs):
         """Initialize with any context needed for execution."""
         self.context = kwargs
     
     @classmethod
     def get_schema(cls) -> Dict[str, Any]:
-        """Generate the function schema for LLM function calling."""
+        """Generate the function schema for LLM function calling.
+        
+        The schema is generated once per class and cached, so the returned
+        dictionary must not be modified.
+        """
+        # Look in the class's own namespace so subclasses don't reuse a parent's schema
+        schema = cls.__dict__.get("_schema")
+        if schema is not None:
+            return schema
+        
         if not cls.InputModel:
             raise ValueError(f"Function {cls.name} must define an InputModel")
         
         # Get the JSON schema from the Pydantic model
-        schema = cls.InputModel.model_json_schema()
-        
-        return {
+        schema = {
             "type": "function",
             "function": {
                 "name": cls.name,
                 "description": cls.description,
-                "parameters": schema
+                "parameters": cls.InputModel.model_json_schema()
             }
         }
+        cls._schema = schema
+        return schema
     
-    def __call__(self, **kwargs) -> Dict[str, Any]:
+    @classmethod
+    def validate_fast(cls, args: Dict[str, Any]) -> Optional[BaseModel]:
+        """Build the input model without running the full validator.
+        
+        Subclasses with trivial inputs can override this to check the arguments
+        themselves and return an input model built with model_construct. Returning
+        None falls back to the full validation of the InputModel.
+        
+        Args:
+            args: The arguments passed to the function
+            
+        Returns:
+            The input model, or None to validate the arguments with the InputModel
+        """
+        return None
+    
+    @classmethod
+    def get_validator(cls) -> Callable[[Dict[str, Any]], BaseModel]:
+        """Get the compiled validator of the function's InputModel.
+        
+        The validator is looked up once per class and cached, so calls skip the
+        model_validate wrapper and go straight to pydantic-core.
+        """
+        validator = cls.__dict__.get("_validator")
+        if validator is not None:
+            return validator
+        
+        if not cls.InputModel:
+            raise ValueError(f"Function {cls.name} must define an InputModel")
+        
+        # Make sure the model is fully built before taking its validator
+        cls.InputModel.model_rebuild()
+        validator = cls.InputModel.__pydantic_validator__.validate_python
+        cls._validator = validator
+        return validator
+    
+    def __call__(self, _input: Optional[BaseModel] = None, /, **kwargs) -> Dict[str, Any]:
         """Execute the function with the given arguments.
         
         This method validates the input using the InputModel before execution.
+        An InputModel instance can be passed instead of keyword arguments, in
+        which case it is used as is, since it was validated when it was built.
         """
         if not self.InputModel:
             raise ValueError(f"Function {self.name} must define an InputModel")
             
         try:
-            # Validate inputs using the Pydantic model
-            validated_input = self.InputModel(**kwargs)
+            if _input is not None:
+                if not isinstance(_input, self.InputModel):
+                    raise TypeError(f"Expected {self.InputModel.__qualname__}, got {type(_input).__qualname__}")
+                return self.execute(_input)
+            
+            # Validate the arguments directly with the model's compiled validator,
+            # unless the function can check them itself
+            validated_input = self.validate_fast(kwargs)
+            if validated_input is None:
+                validated_input = self.get_validator()(kwargs)
             
             # Call the execute method with validated inputs
             return self.execute(validated_input)
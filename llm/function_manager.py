@@ -9,23 +9,19 @@ This module provides the FunctionManager class for managing and executing functi
 
 import json
 import logging
-import inspect
-import importlib
-import pkgutil
-import os
-from typing import Dict, Any, List, Type, Optional, ClassVar, Set, Callable
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Tuple, Type, Optional, ClassVar, Set, Callable
 
 # Set up logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
-# Configure console handler if not already configured
-if not logger.handlers:
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Shared context for tool calls made without one
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+# Registry of functions by name, looked up as module globals on the hot path
+_FUNCTIONS: Dict[str, Type["Function"]] = {}
+_get_function = _FUNCTIONS.get
 
 
 class FunctionManager:
@@ -36,13 +32,27 @@ class FunctionManager:
     Functions are automatically registered when imported.
     """
     
-    # Class-level registry of functions
-    _functions: Dict[str, Type["Function"]] = {}
+    # Class-level alias of the module registry of functions
+    _functions: ClassVar[Dict[str, Type["Function"]]] = _FUNCTIONS
     _initialized = False
     
+    # Read-only view of the registry, and the schemas of the registered
+    # functions, built on first use and reset whenever a function is registered
+    _functions_view: ClassVar[Mapping[str, Type["Function"]]] = MappingProxyType(_FUNCTIONS)
+    _schemas_cache: ClassVar[Optional[Tuple[Dict[str, Any], ...]]] = None
+    _function_schemas_cache: ClassVar[Optional[Tuple[Dict[str, Any], ...]]] = None
+    _function_schemas_bytes: ClassVar[Optional[bytes]] = None
+    
+    # Instances of stateless functions called through execute_tool_call without
+    # a context, stored with the class they were created from
+    _tool_call_instances: ClassVar[Dict[str, Tuple[Type["Function"], Callable[..., Dict[str, Any]]]]] = {}
+    
     def __init__(self, **kwargs):
         """Initialize with any context needed for execution."""
         self.context = kwargs
+        
+        # Instances of stateless functions created with this context
+        self._instance_cache: Dict[str, Tuple[Type["Function"], Callable[..., Dict[str, Any]]]] = {}
         logger.info("FunctionManager initialized")
         
         # Ensure functions are loaded
@@ -57,81 +67,65 @@ class FunctionManager:
         This can be used as a decorator, but functions are also automatically registered
         when they are imported, so explicit registration is usually not necessary.
         """
-        function_name = function_class.name
-        if function_name in cls._functions:
+        # Intern the name so lookups with an interned name compare by identity
+        function_name = function_class.name = sys.intern(function_class.name)
+        if function_name in _FUNCTIONS:
             logger.warning(f"Function {function_name} already registered. Overwriting.")
-        cls._functions[function_name] = function_class
+        _FUNCTIONS[function_name] = function_class
+        cls._schemas_cache = None
+        cls._function_schemas_cache = None
+        cls._function_schemas_bytes = None
         logger.info(f"Registered function: {function_name}")
         return function_class
     
     @classmethod
     def get_function(cls, function_name: str) -> Optional[Type["Function"]]:
         """Get a function class by name."""
-        return cls._functions.get(function_name)
+        return _get_function(function_name)
     
     @classmethod
-    def get_all_functions(cls) -> Dict[str, Type["Function"]]:
-        """Get all registered functions."""
-        return cls._functions.copy()
+    def get_all_functions(cls) -> Mapping[str, Type["Function"]]:
+        """Get a read-only view of all registered functions."""
+        return cls._functions_view
     
     @classmethod
-    def get_all_schemas(cls) -> List[Dict[str, Any]]:
-        """Get schemas for all registered functions."""
+    def get_all_schemas(cls) -> Tuple[Dict[str, Any], ...]:
+        """Get schemas for all registered functions.
+        
+        The schemas are built once and cached until another function is registered.
+        """
         # Ensure functions are loaded
         if not cls._initialized:
             cls.discover_functions()
-        return [func.get_schema() for func in cls._functions.values()]
+        if cls._schemas_cache is None:
+            cls._schemas_cache = tuple(func.get_schema() for func in _FUNCTIONS.values())
+        return cls._schemas_cache
     
     @classmethod
     def discover_functions(cls):
         """
-        Discover and register all functions in the functions package.
+        Register all functions of the functions package.
         
         This method is called automatically when the FunctionManager is first initialized
         or when get_all_schemas is called.
         
-        Files excluded from discovery:
-        - __init__.py - Package initialization
-        - base.py - Base classes (if exists)
-        - template.py - Template for creating new functions
-        - README.md - Documentation
+        The functions are taken from the REGISTERED tuple of llm.functions, so no
+        modules are scanned or inspected at startup.
         """
         if cls._initialized:
             return
         
         try:
-            # Import the functions package
             from llm import functions
             
-            # Get the package path
-            package_path = os.path.dirname(functions.__file__)
-            
-            # Files to exclude from discovery
-            excluded_files = ['__init__', 'base', 'template']
-            
-            # Import all modules in the functions package
-            for _, module_name, is_pkg in pkgutil.iter_modules([package_path]):
-                # Skip excluded files
-                if module_name in excluded_files:
-                    logger.debug(f"Skipping excluded file: {module_name}.py")
-                    continue
-                
-                # Import the module
-                module = importlib.import_module(f"llm.functions.{module_name}")
-                
-                # Find all Function subclasses in the module
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, functions.Function) and 
-                        obj != functions.Function and
-                        hasattr(obj, 'name') and
-                        obj.name):  # Only register functions with a name
-                        
-                        # Register the function
-                        cls.register(obj)
+            for function_class in functions.REGISTERED:
+                # Only register functions with a name, and skip classes that were
+                # already registered explicitly
+                if function_class.name and _get_function(function_class.name) is not function_class:
+                    cls.register(function_class)
             
             cls._initialized = True
-            logger.info(f"Discovered and registered {len(cls._functions)} functions")
+            logger.info(f"Discovered and registered {len(_FUNCTIONS)} functions")
         except Exception as e:
             logger.error(f"Error discovering functions: {str(e)}")
     
@@ -146,14 +140,15 @@ class FunctionManager:
         Returns:
             The result of the function execution
         """
-        function_class = self._functions.get(function_name)
+        if isinstance(function_name, str):
+            function_name = sys.intern(function_name)
+        function_class = _get_function(function_name)
         if not function_class:
             logger.error(f"Function {function_name} not found")
             return {"error": f"Function {function_name} not found"}
         
         try:
-            # Create an instance of the function with the context
-            function_instance = function_class(**self.context)
+            function_instance = self._get_instance(self._instance_cache, function_class, self.context)
             
             # Call the function with the arguments
             return function_instance(**args)
@@ -175,26 +170,84 @@ class FunctionManager:
         """
         function_name = tool_call.get("name")
         arguments = tool_call.get("arguments", {})
+        if isinstance(function_name, str):
+            function_name = sys.intern(function_name)
         
-        function_class = cls._functions.get(function_name)
+        function_class = _get_function(function_name)
         if not function_class:
             logger.error(f"Function {function_name} not found")
             return {"error": f"Function {function_name} not found"}
         
         try:
-            # Create an instance of the function with the context
-            function_instance = function_class(**(context or {}))
+            if context:
+                function_instance = function_class(**context)
+            else:
+                function_instance = cls._get_instance(cls._tool_call_instances, function_class, _EMPTY_CONTEXT)
             
             # Call the function with the arguments
             return function_instance(**arguments)
         except Exception as e:
             logger.error(f"Error executing function {function_name}: {str(e)}")
             return {"error": str(e)}
+    
+    @staticmethod
+    def _get_instance(
+        cache: Dict[str, Tuple[Type["Function"], Callable[..., Dict[str, Any]]]],
+        function_class: Type["Function"],
+        context: Mapping[str, Any],
+    ) -> Callable[..., Dict[str, Any]]:
+        """
+        Get an instance of a function class created with the given context.
+        
+        Stateless functions are created once and reused from the cache for as long
+        as the same class stays registered; other functions get a new instance.
+        
+        Args:
+            cache: The instances already created with this context
+            function_class: The function class to instantiate
+            context: The context to pass to the function
+            
+        Returns:
+            The function instance
+        """
+        cached = cache.get(function_class.name)
+        if cached is not None and cached[0] is function_class:
+            return cached[1]
+        
+        # Create an instance of the function with the context
+        function_instance = function_class(**context)
+        if function_class.stateless:
+            cache[function_class.name] = (function_class, function_instance)
+        return function_instance
 
 
 # Function to get all function schemas for LLM function calling
 def get_function_schemas() -> List[Dict]:
-    """Get all registered function schemas."""
+    """Get all registered function schemas.
+    
+    The schemas are built once and cached until another function is registered;
+    each call returns a new list of the cached schema dictionaries.
+    """
+    if FunctionManager._function_schemas_cache is None:
+        FunctionManager._function_schemas_cache = tuple(_build_function_schemas())
+    return list(FunctionManager._function_schemas_cache)
+
+
+def get_function_schemas_bytes() -> bytes:
+    """Get all registered function schemas serialized as compact UTF-8 JSON.
+    
+    The JSON is built once from the cached schemas and reused until another
+    function is registered, so it can be sent as a request body without
+    serializing the schemas again.
+    """
+    if FunctionManager._function_schemas_bytes is None:
+        schemas = get_function_schemas()
+        FunctionManager._function_schemas_bytes = json.dumps(schemas, separators=(',', ':')).encode('utf-8')
+    return FunctionManager._function_schemas_bytes
+
+
+def _build_function_schemas() -> List[Dict]:
+    """Build the schemas of all registered functions and the memory function."""
     schemas = []
     
     # Add all registered functions
@@ -5,18 +5,42 @@
 LLM Spider - Functions Package
 
 This package contains all the functions that can be called by the LLM.
-Functions are automatically discovered and registered by the FunctionManager.
+Functions listed in REGISTERED are registered by the FunctionManager.
+
+Function classes are imported lazily: each module is loaded the first time
+one of its names is accessed (PEP 562), so importing the package does not
+import every function and its dependencies.
 """
 
+import importlib
+
 # Import the Function base class from the parent package
 from llm.function import Function
 
-# Import all functions for registration
-from .fetch_webpage import FetchWebpage
-from .parse_with_parser import ParseWithParser
-from .test_function import TestFunction
-from .get_weather import GetWeather
-from .parse_webpage import ParseWebpage
+# Module that defines each lazily imported name, relative to this package
+_LAZY = {
+    'FetchWebpage': '.fetch_webpage',
+    'ParseWithParser': '.parse_with_parser',
+    'TestFunction': '.test_function',
+    'GetWeather': '.get_weather',
+    'ParseWebpage': '.parse_webpage',
+    'ParsePages': '.parse_pages',
+    # Kept here for code that imported them from the old llm/functions.py module
+    'FunctionManager': 'llm.function_manager',
+    'get_function_schemas': 'llm.function_manager',
+    'get_function_schemas_bytes': 'llm.function_manager',
+}
+
+# Functions registered by FunctionManager.discover_functions; accessing
+# REGISTERED imports them and returns the classes as a tuple
+_REGISTERED_NAMES = (
+    'FetchWebpage',
+    'ParseWithParser',
+    'TestFunction',
+    'GetWeather',
+    'ParseWebpage',
+    'ParsePages',
+)
 
 # Export all functions
 __all__ = [
@@ -26,4 +50,26 @@ __all__ = [
     'TestFunction',
     'GetWeather',
     'ParseWebpage',
-] 
\ No newline at end of file
+    'ParsePages',
+    'REGISTERED',
+    'FunctionManager',
+    'get_function_schemas',
+    'get_function_schemas_bytes',
+]
+
+
+def __getattr__(name):
+    """Import a function class, or the REGISTERED tuple, on first access."""
+    if name == 'REGISTERED':
+        value = tuple(globals().get(n) or __getattr__(n) for n in _REGISTERED_NAMES)
+    elif name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache the value so later accesses are plain module attribute lookups
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
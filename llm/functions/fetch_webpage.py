@@ -8,7 +8,7 @@ This module provides a function to fetch the HTML content of a webpage.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 from llm.function import Function
@@ -20,8 +20,11 @@ logger = logging.getLogger(__name__)
 class FetchWebpage(Function):
     """Function to fetch the HTML content of a webpage."""
     
+    __slots__ = ()
+    
     name = "fetch_webpage"
     description = "Fetch the HTML content of a webpage"
+    stateless = True
     
     class InputModel(BaseModel):
         """Input model for the fetch_webpage function."""
@@ -30,6 +33,13 @@ class FetchWebpage(Function):
             description="The URL of the webpage to fetch"
         )
     
+    @classmethod
+    def validate_fast(cls, args: Dict[str, Any]) -> Optional[BaseModel]:
+        """Build the input model directly when the only argument is a string url."""
+        if len(args) == 1 and type(args.get("url")) is str:
+            return cls.InputModel.model_construct(url=args["url"])
+        return None
+    
     def execute(self, validated_input: InputModel) -> Dict[str, Any]:
         """Execute the function with the given arguments."""
         url = validated_input.url
@@ -39,7 +49,7 @@ class FetchWebpage(Function):
         if not parser_designer:
             return {"error": "Parser designer not initialized"}
         
-        logger.info(f"Fetching webpage: {url}")
+        logger.info("Fetching webpage: %s", url)
         
         # Call the actual implementation
         return parser_designer._fetch_webpage(url) 
\ No newline at end of file
@@ -22,8 +22,11 @@ logger = logging.getLogger(__name__)
 class GetWeather(Function):
     """Function to get the weather for a location."""
     
+    __slots__ = ()
+    
     name = "get_weather"
     description = "Get the current weather in a given location"
+    stateless = True
     
     class InputModel(BaseModel):
         """Input model for the get_weather function."""
@@ -50,7 +53,7 @@ class GetWeather(Function):
         location = validated_input.location
         unit = validated_input.unit
         
-        logger.info(f"Getting weather for {location} in {unit}")
+        logger.info("Getting weather for %s in %s", location, unit)
         
         # In a real implementation, you would call a weather API here
         # For now, we'll just return mock data
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Spider - Parse Pages Function
+
+This module provides a function to parse several webpages with the same parser.
+"""
+
+import logging
+from typing import Dict, Any, List
+from pydantic import BaseModel, Field
+
+from llm.function import Function
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ParsePages(Function):
+    """Function to fetch and parse several webpages with one parser configuration."""
+    
+    __slots__ = ()
+    
+    name = "parse_pages"
+    description = "Fetch several webpages and parse each of them with the same parser configuration"
+    stateless = True
+    
+    class InputModel(BaseModel):
+        """Input model for the parse_pages function."""
+        urls: List[str] = Field(
+            ..., 
+            description="The URLs of the webpages to parse"
+        )
+        parser_config: Dict[str, Any] = Field(
+            ..., 
+            description="The parser configuration to use, with a 'type' of 'list' or 'content' and its selectors"
+        )
+    
+    def execute(self, validated_input: InputModel) -> Dict[str, Any]:
+        """Execute the function with the given arguments."""
+        # Imported here so registering the function doesn't load the scraping stack
+        from scraping.utils import parse_pages
+        
+        urls = validated_input.urls
+        parser_config = validated_input.parser_config
+        
+        logger.info("Parsing %s pages with a %s parser", len(urls), parser_config.get("type", "unknown"))
+        
+        return {"results": parse_pages(urls, parser_config)}
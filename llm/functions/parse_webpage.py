@@ -8,7 +8,7 @@ This module provides a function to parse webpages with state machine control.
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple
 from pydantic import BaseModel, Field
 
 from llm.function import Function
@@ -20,8 +20,11 @@ logger = logging.getLogger(__name__)
 class ParseWebpage(Function):
     """Function to parse webpages with state machine control."""
     
+    __slots__ = ()
+    
     name = "parse_webpage"
     description = "Parse a webpage with state machine control"
+    stateless = True
     
     class InputModel(BaseModel):
         """Input model for the parse_webpage function."""
@@ -42,6 +45,49 @@ class ParseWebpage(Function):
             description="The parser configuration to use for parsing"
         )
     
+    # Handlers of each state, by the name of the ParserDesigner state constant: the
+    # check run before any action of the state, and the handler of each action
+    # (an action of None accepts any action)
+    _STATES: ClassVar[Dict[str, Tuple[Optional[str], Dict[Optional[str], str]]]] = {
+        "STATE_WAITING_FOR_URL": (None, {None: "_store_url"}),
+        "STATE_FETCHING_HTML": (None, {"fetch": "_fetch_html", "retry": "_refetch_html"}),
+        "STATE_ANALYZING_CONTENT": ("_check_html", {"analyze": "_analyze_content"}),
+        "STATE_CONFIRMING_EXTRACTION": ("_check_parser_config", {"confirm": "_confirm_extraction"}),
+        "STATE_CREATING_PARSER": ("_check_parser_config", {"create": "_create_parser"}),
+        "STATE_TESTING_PARSER": ("_check_designer_parser_config", {"test": "_test_parser"}),
+        "STATE_FINAL_CONFIRMATION": (None, {"save": "_save_parser", "modify": "_modify_parser"}),
+        "STATE_RECOVERY": (None, {"recover": "_recover"}),
+    }
+    
+    # Memory key that allows recovering to each state, from the latest state back;
+    # without any of them recovery goes back to waiting for a URL
+    _RECOVERY_ORDER: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("parsing_result", "STATE_FINAL_CONFIRMATION"),
+        ("parser_code", "STATE_TESTING_PARSER"),
+        ("title", "STATE_CREATING_PARSER"),
+        ("html", "STATE_ANALYZING_CONTENT"),
+        ("url", "STATE_FETCHING_HTML"),
+    )
+    
+    # Dispatch tables keyed by state value, built once per parser designer class
+    _dispatch_tables: ClassVar[Dict[type, Dict[str, Tuple[Optional[Callable], Dict[Optional[str], Callable]]]]] = {}
+    
+    @classmethod
+    def _dispatch_table(cls, parser_designer) -> Dict[str, Tuple[Optional[Callable], Dict[Optional[str], Callable]]]:
+        """Get the dispatch table for the states of a parser designer."""
+        designer_class = type(parser_designer)
+        table = cls._dispatch_tables.get(designer_class)
+        if table is None:
+            table = {
+                getattr(parser_designer, state_name): (
+                    getattr(cls, check) if check else None,
+                    {action: getattr(cls, handler) for action, handler in actions.items()}
+                )
+                for state_name, (check, actions) in cls._STATES.items()
+            }
+            cls._dispatch_tables[designer_class] = table
+        return table
+    
     def execute(self, validated_input: InputModel) -> Dict[str, Any]:
         """Execute the function with the given arguments."""
         url = validated_input.url
@@ -54,129 +100,126 @@ class ParseWebpage(Function):
         if not parser_designer:
             return {"error": "Parser designer not initialized"}
         
-        logger.info(f"Processing webpage in state {state} with action {action}")
+        logger.info("Processing webpage in state %s with action %s", state, action)
         
         try:
-            # Handle different states
-            if state == parser_designer.STATE_WAITING_FOR_URL:
-                # Store URL in memory and transition to fetching state
-                parser_designer.memory["url"] = url
-                parser_designer._handle_state_transition(parser_designer.STATE_FETCHING_HTML)
-                return {"status": "success", "message": "URL stored, transitioning to fetch state"}
-            
-            elif state == parser_designer.STATE_FETCHING_HTML:
-                # Fetch HTML content
-                if action == "fetch":
-                    fetch_result = parser_designer._fetch_webpage(url)
-                    return fetch_result
-                elif action == "retry":
-                    parser_designer.html_content = None
-                    fetch_result = parser_designer._fetch_webpage(url)
-                    return fetch_result
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
-            
-            elif state == parser_designer.STATE_ANALYZING_CONTENT:
-                # Analyze HTML content
-                if not parser_designer.html_content:
-                    return {"error": "No HTML content available"}
-                
-                if action == "analyze":
-                    # Store HTML in memory
-                    parser_designer.memory["html"] = parser_designer.html_content
-                    return {
-                        "status": "success",
-                        "html_preview": parser_designer.html_content[:1000] + "...",
-                        "html_length": len(parser_designer.html_content)
-                    }
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
-            
-            elif state == parser_designer.STATE_CONFIRMING_EXTRACTION:
-                # Confirm extracted data
-                if not parser_config:
-                    return {"error": "No parser configuration provided"}
-                
-                if action == "confirm":
-                    # Store extracted data in memory
-                    parser_designer.memory.update({
-                        "title": parser_config.get("title_selector", ""),
-                        "date": parser_config.get("date_selector", ""),
-                        "body": parser_config.get("body_selector", "")
-                    })
-                    parser_designer._handle_state_transition(parser_designer.STATE_CREATING_PARSER)
-                    return {"status": "success", "message": "Extraction confirmed"}
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
-            
-            elif state == parser_designer.STATE_CREATING_PARSER:
-                # Create parser
-                if not parser_config:
-                    return {"error": "No parser configuration provided"}
-                
-                if action == "create":
-                    # Store parser configuration
-                    parser_designer.parser_config = parser_config
-                    parser_designer.memory["parser_code"] = parser_config
-                    parser_designer._handle_state_transition(parser_designer.STATE_TESTING_PARSER)
-                    return {"status": "success", "message": "Parser created"}
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
-            
-            elif state == parser_designer.STATE_TESTING_PARSER:
-                # Test parser
-                if not parser_designer.parser_config:
-                    return {"error": "No parser configuration available"}
-                
-                if action == "test":
-                    # Test the parser
-                    parse_result = parser_designer._parse_with_parser(url, parser_designer.parser_config)
-                    if parse_result.get("error"):
-                        return parse_result
-                    
-                    # Store parsing result in memory
-                    parser_designer.memory["parsing_result"] = parse_result
-                    parser_designer._handle_state_transition(parser_designer.STATE_FINAL_CONFIRMATION)
-                    return parse_result
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
+            entry = self._dispatch_table(parser_designer).get(state)
+            if entry is None:
+                return {"error": f"Invalid state: {state}"}
             
-            elif state == parser_designer.STATE_FINAL_CONFIRMATION:
-                # Final confirmation
-                if action == "save":
-                    # Save the parser
-                    parser_designer.save_parser()
-                    return {"status": "success", "message": "Parser saved"}
-                elif action == "modify":
-                    # Go back to creating parser
-                    parser_designer._handle_state_transition(parser_designer.STATE_CREATING_PARSER)
-                    return {"status": "success", "message": "Returning to parser creation"}
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
+            check, actions = entry
+            if check:
+                error = check(self, parser_designer, parser_config)
+                if error:
+                    return error
             
-            elif state == parser_designer.STATE_RECOVERY:
-                # Recovery state
-                if action == "recover":
-                    # Try to recover based on available memory
-                    if "parsing_result" in parser_designer.memory:
-                        parser_designer._handle_state_transition(parser_designer.STATE_FINAL_CONFIRMATION)
-                    elif "parser_code" in parser_designer.memory:
-                        parser_designer._handle_state_transition(parser_designer.STATE_TESTING_PARSER)
-                    elif "title" in parser_designer.memory:
-                        parser_designer._handle_state_transition(parser_designer.STATE_CREATING_PARSER)
-                    elif "html" in parser_designer.memory:
-                        parser_designer._handle_state_transition(parser_designer.STATE_ANALYZING_CONTENT)
-                    elif "url" in parser_designer.memory:
-                        parser_designer._handle_state_transition(parser_designer.STATE_FETCHING_HTML)
-                    else:
-                        parser_designer._handle_state_transition(parser_designer.STATE_WAITING_FOR_URL)
-                    return {"status": "success", "message": f"Recovered to state {parser_designer.current_state}"}
-                else:
-                    return {"error": f"Invalid action {action} for state {state}"}
-            
-            else:
-                return {"error": f"Invalid state: {state}"}
+            handler = actions.get(action) or actions.get(None)
+            if handler is None:
+                return {"error": f"Invalid action {action} for state {state}"}
+            return handler(self, parser_designer, url, parser_config)
             
         except Exception as e:
             logger.error(f"Error in parse_webpage: {str(e)}")
-            return {"error": str(e)} 
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def _check_html(self, parser_designer, parser_config: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Check that HTML content has been fetched."""
+        if not parser_designer.html_content:
+            return {"error": "No HTML content available"}
+        return None
+    
+    def _check_parser_config(self, parser_designer, parser_config: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Check that a parser configuration was provided."""
+        if not parser_config:
+            return {"error": "No parser configuration provided"}
+        return None
+    
+    def _check_designer_parser_config(self, parser_designer, parser_config: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Check that the parser designer has a parser configuration."""
+        if not parser_designer.parser_config:
+            return {"error": "No parser configuration available"}
+        return None
+    
+    def _store_url(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store URL in memory and transition to fetching state."""
+        parser_designer.memory["url"] = url
+        parser_designer._handle_state_transition(parser_designer.STATE_FETCHING_HTML)
+        return {"status": "success", "message": "URL stored, transitioning to fetch state"}
+    
+    def _fetch_html(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch HTML content."""
+        return parser_designer._fetch_webpage(url)
+    
+    def _refetch_html(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Discard the fetched HTML content and fetch it again."""
+        parser_designer.html_content = None
+        parser_designer.html_preview = None
+        return parser_designer._fetch_webpage(url)
+    
+    def _analyze_content(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store HTML in memory and return a preview of it."""
+        html = parser_designer.html_content
+        parser_designer.memory["html"] = html
+        
+        # Reuse the designer's preview while the same page is analyzed again; the
+        # page is compared by identity since a new fetch always stores a new string
+        cached = parser_designer.html_preview
+        if cached is not None and cached[0] is html:
+            preview = cached[1]
+        else:
+            preview = html[:1000] + "..."
+            parser_designer.html_preview = (html, preview)
+        
+        return {
+            "status": "success",
+            "html_preview": preview,
+            "html_length": len(html)
+        }
+    
+    def _confirm_extraction(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store extracted data in memory."""
+        parser_designer.memory.update({
+            "title": parser_config.get("title_selector", ""),
+            "date": parser_config.get("date_selector", ""),
+            "body": parser_config.get("body_selector", "")
+        })
+        parser_designer._handle_state_transition(parser_designer.STATE_CREATING_PARSER)
+        return {"status": "success", "message": "Extraction confirmed"}
+    
+    def _create_parser(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store parser configuration."""
+        parser_designer.parser_config = parser_config
+        parser_designer.memory["parser_code"] = parser_config
+        parser_designer._handle_state_transition(parser_designer.STATE_TESTING_PARSER)
+        return {"status": "success", "message": "Parser created"}
+    
+    def _test_parser(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Test the parser and store the parsing result in memory."""
+        parse_result = parser_designer._parse_with_parser(url, parser_designer.parser_config)
+        if parse_result.get("error"):
+            return parse_result
+        
+        parser_designer.memory["parsing_result"] = parse_result
+        parser_designer._handle_state_transition(parser_designer.STATE_FINAL_CONFIRMATION)
+        return parse_result
+    
+    def _save_parser(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Save the parser."""
+        parser_designer.save_parser()
+        return {"status": "success", "message": "Parser saved"}
+    
+    def _modify_parser(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Go back to creating parser."""
+        parser_designer._handle_state_transition(parser_designer.STATE_CREATING_PARSER)
+        return {"status": "success", "message": "Returning to parser creation"}
+    
+    def _recover(self, parser_designer, url: str, parser_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Try to recover based on available memory."""
+        memory = parser_designer.memory
+        target_state = parser_designer.STATE_WAITING_FOR_URL
+        for key, state_name in self._RECOVERY_ORDER:
+            if key in memory:
+                target_state = getattr(parser_designer, state_name)
+                break
+        parser_designer._handle_state_transition(target_state)
+        return {"status": "success", "message": f"Recovered to state {parser_designer.current_state}"}
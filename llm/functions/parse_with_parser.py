@@ -20,8 +20,11 @@ logger = logging.getLogger(__name__)
 class ParseWithParser(Function):
     """Function to parse HTML content with a parser."""
     
+    __slots__ = ()
+    
     name = "parse_with_parser"
     description = "Parse HTML content with a parser"
+    stateless = True
     
     class InputModel(BaseModel):
         """Input model for the parse_with_parser function."""
@@ -44,7 +47,7 @@ class ParseWithParser(Function):
         if not parser_designer:
             return {"error": "Parser designer not initialized"}
         
-        logger.info(f"Parsing HTML with parser: {parser_name or 'default'}")
+        logger.info("Parsing HTML with parser: %s", parser_name or 'default')
         
         # Call the actual implementation
         return parser_designer._parse_with_parser(html, parser_name) 
\ No newline at end of file
@@ -29,6 +29,8 @@ class TemplateFunction(Function):
     Copy this file and rename it to create a new function.
     """
     
+    __slots__ = ()
+    
     # Define the function name, description, parameters, and required parameters
     name = "template_function"
     description = "Template function description"
@@ -59,7 +61,7 @@ class TemplateFunction(Function):
         # if not example_context:
         #     return {"error": "Example context not initialized"}
         
-        logger.info(f"Executing template function with param1={param1}")
+        logger.info("Executing template function with param1=%s", param1)
         
         # Implement the function logic
         result = {
@@ -20,6 +20,8 @@ logger = logging.getLogger(__name__)
 class TestFunction(Function):
     """A simple test function for testing function calling."""
     
+    __slots__ = ()
+    
     name = "test_function"
     description = "A simple test function that echoes its input"
     
@@ -51,14 +53,17 @@ class TestFunction(Function):
         prefix = validated_input.prefix
         tags = validated_input.tags or []
         
-        logger.info(f"Test function called with message: {message}, repeat: {repeat}")
+        logger.info("Test function called with message: %s, repeat: %s", message, repeat)
         
         # Process the input
         if prefix:
             message = f"{prefix}: {message}"
             
-        # Repeat the message
-        repeated_message = " ".join([message] * repeat)
+        # Repeat the message, separated by spaces
+        if repeat == 1:
+            repeated_message = message
+        else:
+            repeated_message = (message + " ") * (repeat - 1) + message
         
         # Return the result
         return {
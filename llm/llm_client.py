@@ -10,30 +10,141 @@ multiple providers including OpenAI, Anthropic, and local LLM servers.
 
 import os
 import json
+import atexit
+import asyncio
 import logging
 import datetime
+import functools
 import pathlib
-from typing import List, Dict, Any, Optional, Generator, Union, Literal
-from dataclasses import dataclass
+import queue
+import sys
+import threading
+import time
+from typing import List, Dict, Any, Optional, Generator, AsyncGenerator, Tuple, Union, Literal
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from dotenv import load_dotenv
+import httpx
 import litellm
 from litellm.utils import ModelResponse
 
+from .cache import LLMCache
+
 # Load environment variables
 load_dotenv()
 
 # Set up logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
-if not logger.handlers:
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Connection limits of the HTTP client shared by all LLM calls
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=300.0)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Sampling temperature of LLM calls unless the caller passes one
+DEFAULT_TEMPERATURE = 0.7
+
+# Minimum number of characters per content chunk yielded from a stream
+STREAM_FLUSH_CHARS = 32
+
+# Parameters of _prepare_call that litellm consumes instead of sending to the provider
+LITELLM_ONLY_PARAMS = ("stream", "context_window_fallback_dict")
+
+# Upper bound on the number of prompts packed into one batched LLM call
+MAX_BATCH_SIZE = 20
+
+# Prompts longer than this many tokens are sent on their own instead of batched
+MAX_BATCH_PROMPT_TOKENS = 500
+
+BATCH_SYSTEM_PROMPT = (
+    "You will receive a JSON object whose values are independent inputs, keyed by id. "
+    "Handle each input separately as instructed below and reply with a single JSON object "
+    "that maps every id to its answer. Use exactly the same ids and include all of them."
+)
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Get the pooled HTTP client shared by all LLM calls.
+    
+    The client is created on first use and keeps connections to the providers
+    alive between calls. HTTP/2 is enabled when the h2 package is installed.
+    
+    Returns:
+        The shared HTTP client
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            _http_client = httpx.Client(http2=http2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            atexit.register(close_http_client)
+        return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client, if it was created."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            if litellm.client_session is _http_client:
+                litellm.client_session = None
+            _http_client.close()
+            _http_client = None
+
+# Queue of LLM call logs written to disk by a background thread
+_log_queue: "queue.Queue[Optional[Tuple[pathlib.Path, int, Dict[str, Any]]]]" = queue.Queue()
+_log_thread: Optional[threading.Thread] = None
+_log_thread_lock = threading.Lock()
+
+
+def _log_worker() -> None:
+    """Write queued LLM call logs to disk until a None entry is received."""
+    created_dirs = set()
+    while True:
+        entry = _log_queue.get()
+        try:
+            if entry is None:
+                return
+            model_dir, timestamp_ns, log_content = entry
+            if model_dir not in created_dirs:
+                model_dir.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(model_dir)
+            log_content = {"timestamp": datetime.datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(), **log_content}
+            log_file_path = model_dir / f"{timestamp_ns}.json"
+            with open(log_file_path, 'w', encoding='utf-8') as f:
+                json.dump(log_content, f, default=str)
+            logger.info("LLM call logged to %s", log_file_path)
+        except Exception as e:
+            logger.error(f"Error logging LLM call: {str(e)}")
+        finally:
+            _log_queue.task_done()
+
+
+def _start_log_writer() -> None:
+    """Start the background thread writing LLM call logs, if it isn't running."""
+    global _log_thread
+    with _log_thread_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(target=_log_worker, name="llm-call-logger", daemon=True)
+            _log_thread.start()
+            atexit.register(_stop_log_writer)
+
+
+def _stop_log_writer() -> None:
+    """Write the pending LLM call logs and stop the background thread."""
+    global _log_thread
+    with _log_thread_lock:
+        if _log_thread is not None:
+            _log_queue.put(None)
+            _log_thread.join()
+            _log_thread = None
 
 class LLMProvider(str, Enum):
     """Enum for supported LLM providers"""
@@ -44,13 +155,81 @@ class LLMProvider(str, Enum):
     LLMSTUDIO = "llmstudio"
     CUSTOM = "custom"
 
-@dataclass
+# Dataclass slots need Python 3.10; older versions keep a __dict__ per response
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class LLMResponse:
     """Data class to hold LLM response information"""
     content: str
     tool_calls: Optional[List[Dict[str, Any]]] = None
     role: str = "assistant"
 
+@dataclass(**_DATACLASS_SLOTS)
+class _StreamState:
+    """Content and tool call fragments collected from a streaming response"""
+    chunk_count: int = 0
+    content_parts: List[str] = field(default_factory=list)
+    tool_call_parts: Dict[int, List[Any]] = field(default_factory=dict)
+    pending: List[str] = field(default_factory=list)
+    pending_len: int = 0
+
+    def flush(self) -> Optional[str]:
+        """Take the content received since the last flush, if any."""
+        if not self.pending:
+            return None
+        content = "".join(self.pending)
+        self.pending.clear()
+        self.pending_len = 0
+        return content
+
+# Provider settings from the environment, read once by _load_provider_env
+_PROVIDER_MODEL_MAP: Dict[LLMProvider, str] = {}
+_PROVIDER_KEY_MAP: Dict[LLMProvider, Optional[str]] = {}
+_PROVIDER_BASE_MAP: Dict[LLMProvider, Optional[str]] = {}
+
+
+def _load_provider_env() -> None:
+    """Read the default model, API key and API base of each provider from the environment."""
+    global _PROVIDER_MODEL_MAP, _PROVIDER_KEY_MAP, _PROVIDER_BASE_MAP
+    _PROVIDER_MODEL_MAP = {
+        LLMProvider.OPENAI: os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
+        LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229"),
+        LLMProvider.OLLAMA: os.getenv("OLLAMA_MODEL", "llama3"),
+        LLMProvider.LLAMA_CPP: os.getenv("LLAMA_CPP_MODEL", "llama3"),
+        LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_MODEL", "default"),
+        LLMProvider.CUSTOM: os.getenv("CUSTOM_MODEL", "default"),
+    }
+    _PROVIDER_KEY_MAP = {
+        LLMProvider.OPENAI: os.getenv("OPENAI_API_KEY"),
+        LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_API_KEY"),
+        LLMProvider.OLLAMA: None,  # Ollama doesn't require an API key
+        LLMProvider.LLAMA_CPP: None,  # Local deployment
+        LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_API_KEY"),
+        LLMProvider.CUSTOM: os.getenv("CUSTOM_API_KEY"),
+    }
+    _PROVIDER_BASE_MAP = {
+        LLMProvider.OPENAI: os.getenv("OPENAI_API_BASE"),
+        LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_API_BASE"),
+        LLMProvider.OLLAMA: os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        LLMProvider.LLAMA_CPP: os.getenv("LLAMA_CPP_BASE_URL", "http://localhost:8000"),
+        LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_BASE_URL", "http://localhost:8000"),
+        LLMProvider.CUSTOM: os.getenv("CUSTOM_API_BASE"),
+    }
+
+
+_load_provider_env()
+
+
+@functools.lru_cache(maxsize=32)
+def _coerce_provider(name: str) -> LLMProvider:
+    """Get the provider with the given name, or the custom provider if it's unknown."""
+    try:
+        return LLMProvider(name.lower())
+    except ValueError:
+        logger.warning(f"Unknown provider '{name}', using as custom provider")
+        return LLMProvider.CUSTOM
+
 class LLMClient:
     """A reusable client for LLM interactions with multiple providers."""
     
@@ -59,7 +238,8 @@ class LLMClient:
         provider: Union[str, LLMProvider] = None,
         model: str = None,
         api_key: Optional[str] = None,
-        api_base: Optional[str] = None
+        api_base: Optional[str] = None,
+        cache: Optional[LLMCache] = None
     ):
         """Initialize the LLM client.
         
@@ -68,15 +248,13 @@ class LLMClient:
             model: Model name to use
             api_key: API key for the provider. If None, will try to get from environment.
             api_base: Base URL for API calls. Useful for local deployments.
+            cache: Optional cache of responses. Identical deterministic calls, made
+                with temperature=0, are answered from it instead of calling the LLM again.
         """
         # Set up provider and model
         self.provider = provider or os.getenv("LLM_PROVIDER", LLMProvider.OPENAI)
         if isinstance(self.provider, str):
-            try:
-                self.provider = LLMProvider(self.provider.lower())
-            except ValueError:
-                self.provider = LLMProvider.CUSTOM
-                logger.warning(f"Unknown provider '{provider}', using as custom provider")
+            self.provider = _coerce_provider(self.provider)
         
         # Set up model based on provider if not specified
         self.model = model or self._get_default_model()
@@ -88,46 +266,35 @@ class LLMClient:
         # Configure litellm
         self._configure_litellm()
         
+        # Set up the response cache
+        self.cache = cache
+        
         # Set up logging directory
         self.tmp_folder = os.getenv("TMP_FOLDER", "tmp")
         self.llm_folder = os.getenv("TMP_LLM_FOLDER", "llm")
         self.log_base_path = pathlib.Path(self.tmp_folder) / self.llm_folder
+        _start_log_writer()
+        
+    @classmethod
+    def refresh_env(cls) -> None:
+        """Re-read the provider settings from the environment.
+        
+        The settings are read once at import, so call this after changing the
+        environment for it to apply to new clients.
+        """
+        _load_provider_env()
         
     def _get_default_model(self) -> str:
         """Get the default model based on the provider."""
-        provider_model_map = {
-            LLMProvider.OPENAI: os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview"),
-            LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_MODEL", "claude-3-opus-20240229"),
-            LLMProvider.OLLAMA: os.getenv("OLLAMA_MODEL", "llama3"),
-            LLMProvider.LLAMA_CPP: os.getenv("LLAMA_CPP_MODEL", "llama3"),
-            LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_MODEL", "default"),
-            LLMProvider.CUSTOM: os.getenv("CUSTOM_MODEL", "default"),
-        }
-        return provider_model_map.get(self.provider, "gpt-4-turbo-preview")
+        return _PROVIDER_MODEL_MAP.get(self.provider, "gpt-4-turbo-preview")
     
     def _get_api_key(self) -> Optional[str]:
         """Get the API key based on the provider."""
-        provider_key_map = {
-            LLMProvider.OPENAI: os.getenv("OPENAI_API_KEY"),
-            LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_API_KEY"),
-            LLMProvider.OLLAMA: None,  # Ollama doesn't require an API key
-            LLMProvider.LLAMA_CPP: None,  # Local deployment
-            LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_API_KEY"),
-            LLMProvider.CUSTOM: os.getenv("CUSTOM_API_KEY"),
-        }
-        return provider_key_map.get(self.provider)
+        return _PROVIDER_KEY_MAP.get(self.provider)
     
     def _get_api_base(self) -> Optional[str]:
         """Get the API base URL based on the provider."""
-        provider_base_map = {
-            LLMProvider.OPENAI: os.getenv("OPENAI_API_BASE"),
-            LLMProvider.ANTHROPIC: os.getenv("ANTHROPIC_API_BASE"),
-            LLMProvider.OLLAMA: os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-            LLMProvider.LLAMA_CPP: os.getenv("LLAMA_CPP_BASE_URL", "http://localhost:8000"),
-            LLMProvider.LLMSTUDIO: os.getenv("LLMSTUDIO_BASE_URL", "http://localhost:8000"),
-            LLMProvider.CUSTOM: os.getenv("CUSTOM_API_BASE"),
-        }
-        return provider_base_map.get(self.provider)
+        return _PROVIDER_BASE_MAP.get(self.provider)
     
     def _configure_litellm(self) -> None:
         """Configure litellm based on the provider."""
@@ -138,6 +305,10 @@ class LLMClient:
             elif self.provider == LLMProvider.ANTHROPIC and self.api_key:
                 litellm.anthropic_key = self.api_key
             
+            # Reuse pooled connections across calls, unless the application set its own session
+            if litellm.client_session is None:
+                litellm.client_session = get_http_client()
+            
             # Set custom API base if provided
             if self.api_base:
                 if self.provider == LLMProvider.OPENAI:
@@ -154,173 +325,175 @@ class LLMClient:
     def _log_llm_call(self, model: str, params: Dict[str, Any], response: Any) -> None:
         """Log LLM call to a file.
         
+        The file is written by a background thread so the call isn't slowed
+        down by disk IO.
+        
         Args:
             model: The model name used for the call
             params: The parameters sent to the LLM
             response: The response received from the LLM
         """
         try:
-            # Create timestamp for the log file
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            
-            # Create directory structure if it doesn't exist
+            # Timestamp of the call, also used as the name of the log file
+            timestamp_ns = time.time_ns()
             model_dir = self.log_base_path / f"{self.provider}_{model}"
-            model_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create log file path
-            log_file_path = model_dir / f"{timestamp}.txt"
-            
-            # Prepare log content
+            # Prepare log content. The messages are copied since callers keep
+            # appending to their conversation after the call returns.
+            logged_params = dict(params)
+            if "messages" in logged_params:
+                logged_params["messages"] = list(logged_params["messages"])
             log_content = {
-                "timestamp": datetime.datetime.now().isoformat(),
                 "provider": str(self.provider),
                 "model": model,
-                "params": params,
+                "params": logged_params,
                 "response": self._format_response_for_logging(response)
             }
             
-            # Write to file
-            with open(log_file_path, 'w', encoding='utf-8') as f:
-                json.dump(log_content, f, indent=2, default=str)
-                
-            logger.info(f"LLM call logged to {log_file_path}")
+            # Hand the file write over to the background writer
+            _log_queue.put((model_dir, timestamp_ns, log_content))
         except Exception as e:
             logger.error(f"Error logging LLM call: {str(e)}")
             
+    @functools.singledispatchmethod
     def _format_response_for_logging(self, response: Any) -> Dict[str, Any]:
         """Format the response object for logging.
         
+        The formatting is chosen by the type of the response. Formatters for
+        other response types can be added with
+        LLMClient._format_response_for_logging.register.
+        
         Args:
             response: The response from the LLM
             
         Returns:
             A dictionary representation of the response suitable for logging
         """
-        if isinstance(response, LLMResponse):
-            return {
-                "content": response.content,
-                "tool_calls": response.tool_calls,
-                "role": response.role
-            }
-        elif isinstance(response, ModelResponse):
-            # Handle litellm ModelResponse
-            return {
-                "content": response.choices[0].message.content if response.choices and hasattr(response.choices[0].message, 'content') else "",
-                "tool_calls": self._extract_tool_calls_from_litellm(response),
-                "role": response.choices[0].message.role if response.choices and hasattr(response.choices[0].message, 'role') else "assistant",
-                "model": response.model,
-                "usage": response.usage._asdict() if hasattr(response, "usage") else None
-            }
-        else:
-            # For cases where we can't easily format the response
-            return {"raw": str(response)}
+        # For cases where we can't easily format the response
+        return {"raw": str(response)}
+
+    @_format_response_for_logging.register
+    def _(self, response: LLMResponse) -> Dict[str, Any]:
+        return {
+            "content": response.content,
+            "tool_calls": response.tool_calls,
+            "role": response.role
+        }
+
+    @_format_response_for_logging.register
+    def _(self, response: ModelResponse) -> Dict[str, Any]:
+        # Handle litellm ModelResponse
+        return {
+            "content": response.choices[0].message.content if response.choices and hasattr(response.choices[0].message, 'content') else "",
+            "tool_calls": self._extract_final(response),
+            "role": response.choices[0].message.role if response.choices and hasattr(response.choices[0].message, 'role') else "assistant",
+            "model": response.model,
+            "usage": response.usage._asdict() if hasattr(response, "usage") else None
+        }
             
-    def _extract_tool_calls_from_litellm(self, response: ModelResponse) -> Optional[List[Dict[str, Any]]]:
-        """Extract tool calls from a litellm ModelResponse."""
+    @staticmethod
+    def _parse_tool_arguments(args: Any) -> Any:
+        """Parse the arguments of a tool call, which are usually a JSON string."""
+        if not isinstance(args, str):
+            return args
+        # Try to parse as JSON first
+        try:
+            return json.loads(args)
+        except json.JSONDecodeError:
+            # If it's a raw string, try to extract key-value pairs
+            if ':' in args:
+                key, value = args.split(':', 1)
+                return {key.strip(): value.strip()}
+            return {"url": args.strip()}
+
+    def _extract_final(self, response: ModelResponse) -> Optional[List[Dict[str, Any]]]:
+        """Extract tool calls from the message of a complete litellm response."""
         try:
-            if not response or not hasattr(response, 'choices') or not response.choices:
+            choices = getattr(response, 'choices', None)
+            if not choices:
+                return None
+            message = getattr(choices[0], 'message', None)
+            message_tool_calls = getattr(message, 'tool_calls', None)
+            if not message_tool_calls:
                 return None
             
-            choice = response.choices[0]
-            
-            # For streaming responses with delta
-            if hasattr(choice, 'delta'):
-                if not hasattr(choice.delta, 'tool_calls'):
-                    return None
-                
-                delta_tool_calls = choice.delta.tool_calls
-                if not delta_tool_calls:
-                    return None
-                
-                tool_calls = []
-                for tc in delta_tool_calls:
-                    if hasattr(tc, "function"):
-                        try:
-                            # Get the function name
-                            name = tc.function.name if hasattr(tc.function, 'name') else None
-                            
-                            # Get the arguments
-                            args = tc.function.arguments
-                            if isinstance(args, str):
-                                # Try to parse as JSON first
-                                try:
-                                    args = json.loads(args)
-                                except json.JSONDecodeError:
-                                    # If it's a raw string, try to extract key-value pairs
-                                    if ':' in args:
-                                        try:
-                                            key, value = args.split(':', 1)
-                                            args = {key.strip(): value.strip()}
-                                        except ValueError:
-                                            args = {"url": args.strip()}
-                                    else:
-                                        args = {"url": args.strip()}
-                            
-                            tool_calls.append({
-                                "name": name,
-                                "arguments": args
-                            })
-                        except Exception as e:
-                            logger.error(f"Error extracting tool call from delta: {str(e)}")
-                            continue
-                return tool_calls if tool_calls else None
-            
-            # For non-streaming responses with message
-            if hasattr(choice, 'message'):
-                if not hasattr(choice.message, 'tool_calls'):
-                    return None
-                
-                message_tool_calls = choice.message.tool_calls
-                if not message_tool_calls:
-                    return None
-                
-                tool_calls = []
-                for tc in message_tool_calls:
-                    if hasattr(tc, "function"):
-                        try:
-                            # Get the function name
-                            name = tc.function.name if hasattr(tc.function, 'name') else None
-                            
-                            # Get the arguments
-                            args = tc.function.arguments
-                            if isinstance(args, str):
-                                # Try to parse as JSON first
-                                try:
-                                    args = json.loads(args)
-                                except json.JSONDecodeError:
-                                    # If it's a raw string, try to extract key-value pairs
-                                    if ':' in args:
-                                        try:
-                                            key, value = args.split(':', 1)
-                                            args = {key.strip(): value.strip()}
-                                        except ValueError:
-                                            args = {"url": args.strip()}
-                                    else:
-                                        args = {"url": args.strip()}
-                            
-                            tool_calls.append({
-                                "name": name,
-                                "arguments": args
-                            })
-                        except Exception as e:
-                            logger.error(f"Error extracting tool call from message: {str(e)}")
-                            continue
-                return tool_calls if tool_calls else None
-            
-            return None
+            tool_calls = []
+            for tc in message_tool_calls:
+                function = getattr(tc, 'function', None)
+                if function is None:
+                    continue
+                try:
+                    tool_calls.append({
+                        "name": getattr(function, 'name', None),
+                        "arguments": self._parse_tool_arguments(function.arguments)
+                    })
+                except Exception as e:
+                    logger.error(f"Error extracting tool call from message: {str(e)}")
+            return tool_calls or None
         except Exception as e:
             logger.error(f"Error extracting tool calls: {str(e)}")
             return None
 
-    def call_llm(
+    @staticmethod
+    def _merge_tool_call_deltas(tool_call_parts: Dict[int, List[Any]], delta_tool_calls: List[Any]) -> None:
+        """Merge the tool call fragments of a streaming chunk.
+        
+        Args:
+            tool_call_parts: The name and argument fragments of each tool call so far, by index
+            delta_tool_calls: The tool calls in the delta of the chunk
+        """
+        for position, tc in enumerate(delta_tool_calls):
+            function = getattr(tc, 'function', None)
+            if function is None:
+                continue
+            index = getattr(tc, 'index', None)
+            parts = tool_call_parts.setdefault(position if index is None else index, [None, []])
+            name = getattr(function, 'name', None)
+            if name:
+                parts[0] = name
+            arguments = getattr(function, 'arguments', None)
+            if arguments:
+                parts[1].append(arguments)
+
+    def _extract_streaming(self, tool_call_parts: Dict[int, List[Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Build the tool calls of a completed stream from their merged fragments."""
+        tool_calls = []
+        for index in sorted(tool_call_parts):
+            name, fragments = tool_call_parts[index]
+            try:
+                tool_calls.append({
+                    "name": name,
+                    "arguments": self._parse_tool_arguments("".join(fragments))
+                })
+            except Exception as e:
+                logger.error(f"Error extracting tool call from delta: {str(e)}")
+        return tool_calls or None
+
+    def _response_cache(self, params: Dict[str, Any]) -> Optional[LLMCache]:
+        """Get the cache to use for a call, if its response may be cached.
+        
+        Args:
+            params: The parameters sent to litellm
+            
+        Returns:
+            The response cache, or None if there is none or the call samples
+            with a non-zero temperature
+        """
+        if self.cache is None or not self.cache.cacheable(params):
+            return None
+        return self.cache
+
+    def _prepare_call(
         self,
         messages: List[Dict[str, str]],
-        stream: bool = True,
-        function_schemas: Optional[List[Dict]] = None,
-        model: Optional[str] = None,
-        context_window_fallback_dict: Optional[Dict[str, Any]] = None,
-    ) -> Union[LLMResponse, Generator[str, None, LLMResponse]]:
-        """Call the LLM with the given messages.
+        stream: bool,
+        function_schemas: Optional[List[Dict]],
+        model: Optional[str],
+        context_window_fallback_dict: Optional[Dict[str, Any]],
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Log an LLM call and build the parameters for litellm.
         
         Args:
             messages: List of message dictionaries with 'role' and 'content' keys
@@ -328,9 +501,11 @@ class LLMClient:
             function_schemas: Optional list of function schemas for function calling
             model: Optional model override
             context_window_fallback_dict: Optional dictionary for handling context window limits
+            response_format: Optional response format, e.g. {"type": "json_object"}
+            temperature: Sampling temperature, 0 for deterministic answers
             
         Returns:
-            Either an LLMResponse object or a generator yielding content chunks and finally an LLMResponse
+            The model to use and the parameters for litellm
         """
         # Use provided model or default
         model_to_use = model or self.model
@@ -342,15 +517,16 @@ class LLMClient:
         logger.info(f"Context window fallback provided: {bool(context_window_fallback_dict)}")
         
         # Log messages (excluding potentially sensitive system prompts)
-        for msg in messages:
-            if msg['role'] != 'system':
-                logger.info(f"Message ({msg['role']}): {msg['content'][:100]}...")
+        if logger.isEnabledFor(logging.INFO):
+            for msg in messages:
+                if msg['role'] != 'system':
+                    logger.info("Message (%s): %s...", msg['role'], msg['content'][:100])
 
         # Prepare parameters for litellm
         params = {
             "model": model_to_use,
             "messages": messages,
-            "temperature": 0.7,
+            "temperature": temperature,
             "max_tokens": 1000,
             "stream": stream
         }
@@ -358,12 +534,53 @@ class LLMClient:
         # Add tools if function schemas are provided
         if function_schemas:
             params["tools"] = function_schemas
-            logger.info(f"Function schemas: {json.dumps(function_schemas, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Function schemas: %s", json.dumps(function_schemas))
             
         # Add context window fallback if provided
         if context_window_fallback_dict:
             params["context_window_fallback_dict"] = context_window_fallback_dict
-            logger.info(f"Using context window fallback: {json.dumps(context_window_fallback_dict, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using context window fallback: %s", json.dumps(context_window_fallback_dict))
+
+        # Ask for a structured response if requested
+        if response_format:
+            params["response_format"] = response_format
+
+        return model_to_use, params
+
+    def call_llm(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = True,
+        function_schemas: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        context_window_fallback_dict: Optional[Dict[str, Any]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> Union[LLMResponse, Generator[str, None, LLMResponse]]:
+        """Call the LLM with the given messages.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            stream: Whether to stream the response
+            function_schemas: Optional list of function schemas for function calling
+            model: Optional model override
+            context_window_fallback_dict: Optional dictionary for handling context window limits
+            response_format: Optional response format, e.g. {"type": "json_object"}
+            temperature: Sampling temperature, 0 for deterministic answers
+            
+        Returns:
+            Either an LLMResponse object or a generator yielding content chunks and finally an LLMResponse
+        """
+        model_to_use, params = self._prepare_call(
+            messages, stream, function_schemas, model, context_window_fallback_dict, response_format, temperature
+        )
+
+        cache = self._response_cache(params)
+        cached = cache.get(params) if cache is not None else None
+        if cached is not None:
+            return self._replay_stream(cached) if stream else cached
 
         try:
             logger.info(f"Making LLM API call to {self.provider}...")
@@ -381,49 +598,417 @@ class LLMClient:
         except Exception as e:
             logger.error(f"Error in LLM call: {str(e)}", exc_info=True)
             raise
+
+    async def acall_llm(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = True,
+        function_schemas: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        context_window_fallback_dict: Optional[Dict[str, Any]] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> Union[LLMResponse, AsyncGenerator[Union[str, LLMResponse], None]]:
+        """Call the LLM with the given messages without blocking the event loop.
+        
+        This is the asynchronous version of call_llm, so several calls can run
+        concurrently, for example with asyncio.gather.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            stream: Whether to stream the response
+            function_schemas: Optional list of function schemas for function calling
+            model: Optional model override
+            context_window_fallback_dict: Optional dictionary for handling context window limits
+            response_format: Optional response format, e.g. {"type": "json_object"}
+            temperature: Sampling temperature, 0 for deterministic answers
+            
+        Returns:
+            Either an LLMResponse object or an async generator yielding content chunks and finally an LLMResponse
+        """
+        model_to_use, params = self._prepare_call(
+            messages, stream, function_schemas, model, context_window_fallback_dict, response_format, temperature
+        )
+
+        cache = self._response_cache(params)
+        cached = cache.get(params) if cache is not None else None
+        if cached is not None:
+            return self._areplay_stream(cached) if stream else cached
+
+        try:
+            logger.info(f"Making async LLM API call to {self.provider}...")
+            
+            # Make the API call using litellm
+            response = await litellm.acompletion(**params)
+            
+            logger.info(f"LLM API call successful")
+
+            if stream:
+                return self._ahandle_streaming_response(response, model_to_use, params)
+            else:
+                return self._handle_non_streaming_response(response, model_to_use, params)
+
+        except Exception as e:
+            logger.error(f"Error in LLM call: {str(e)}", exc_info=True)
+            raise
+            
+    async def acall_llm_many(
+        self,
+        message_lists: List[List[Dict[str, str]]],
+        max_concurrency: int = 8,
+        function_schemas: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Make several independent LLM calls concurrently.
+        
+        Args:
+            message_lists: The messages of each call
+            max_concurrency: Maximum number of calls in flight at once
+            function_schemas: Optional list of function schemas for function calling
+            model: Optional model override
+            
+        Returns:
+            The response of each call in order, or the exception it raised, so
+            one failed call doesn't lose the others
             
+        Raises:
+            ValueError: If max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(messages: List[Dict[str, str]]) -> LLMResponse:
+            async with semaphore:
+                return await self.acall_llm(messages, stream=False, function_schemas=function_schemas, model=model)
+
+        return await asyncio.gather(*(call(messages) for messages in message_lists), return_exceptions=True)
+
+    def _count_prompt_tokens(self, prompt: str, model: str) -> int:
+        """Count the tokens of a prompt, or estimate them if the model is unknown to litellm."""
+        try:
+            return litellm.token_counter(model=model, text=prompt)
+        except Exception:
+            return len(prompt) // 4
+
+    def _call_keyed_json(self, batch: Dict[str, str], system_prompt: str, model: Optional[str]) -> Dict[str, Any]:
+        """Send prompts keyed by id in one call and parse the keyed JSON reply.
+        
+        Args:
+            batch: The prompts keyed by id
+            system_prompt: The system prompt asking for keyed JSON answers
+            model: Optional model override
+            
+        Returns:
+            The reply, mapping ids to answers
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": json.dumps(batch, ensure_ascii=False)},
+        ]
+        response = self.call_llm(messages, stream=False, model=model, response_format={"type": "json_object"})
+        results = json.loads(response.content)
+        if not isinstance(results, dict):
+            raise ValueError("LLM reply is not a JSON object")
+        return results
+
+    def call_llm_batch(
+        self,
+        prompts: List[str],
+        instructions: str,
+        batch_size: int = 10,
+        model: Optional[str] = None,
+        max_prompt_tokens: int = MAX_BATCH_PROMPT_TOKENS,
+    ) -> List[Any]:
+        """Answer several independent prompts with as few LLM calls as possible.
+        
+        The prompts are packed into a JSON object keyed by their position, so one
+        call with the shared instructions answers up to batch_size of them. Prompts
+        over max_prompt_tokens, and prompts whose answer is missing from the reply,
+        are sent on their own in the same keyed JSON form.
+        
+        Args:
+            prompts: The independent prompts to answer
+            instructions: Instructions on how to answer each prompt, shared by all of them
+            batch_size: Maximum number of prompts per call, capped at MAX_BATCH_SIZE
+            model: Optional model override
+            max_prompt_tokens: Maximum size of a prompt packed with others
+            
+        Returns:
+            The answer to each prompt in order, as parsed from the JSON reply, or
+            the exception raised while answering it
+        """
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        model_to_use = model or self.model
+        system_prompt = f"{BATCH_SYSTEM_PROMPT}\n\n{instructions}"
+        answers: List[Any] = [None] * len(prompts)
+
+        # Long prompts are answered on their own
+        batched: List[int] = []
+        single: List[int] = []
+        for i, prompt in enumerate(prompts):
+            if self._count_prompt_tokens(prompt, model_to_use) > max_prompt_tokens:
+                single.append(i)
+            else:
+                batched.append(i)
+
+        for start in range(0, len(batched), batch_size):
+            indexes = batched[start:start + batch_size]
+            try:
+                results = self._call_keyed_json({str(i): prompts[i] for i in indexes}, system_prompt, model)
+            except Exception as e:
+                logger.error(f"Error in batched LLM call, answering prompts one by one: {str(e)}")
+                results = {}
+
+            for i in indexes:
+                if str(i) in results:
+                    answers[i] = results[str(i)]
+                else:
+                    single.append(i)
+
+        if single:
+            logger.info("Answering %d of %d prompts one by one", len(single), len(prompts))
+        for i in single:
+            key = str(i)
+            try:
+                results = self._call_keyed_json({key: prompts[i]}, system_prompt, model)
+                if key not in results:
+                    raise ValueError(f"LLM reply has no answer for prompt {key}")
+                answers[i] = results[key]
+            except Exception as e:
+                logger.error(f"Error answering prompt {key}: {str(e)}")
+                answers[i] = e
+
+        return answers
+
+    def _batch_api_kwargs(self) -> Dict[str, Any]:
+        """Get the provider arguments for the litellm Batch API helpers.
+        
+        Returns:
+            Keyword arguments selecting the provider and its credentials
+        
+        Raises:
+            ValueError: If the provider has no Batch API
+        """
+        if self.provider != LLMProvider.OPENAI:
+            raise ValueError(f"Batch API is not supported for provider: {self.provider}")
+        kwargs: Dict[str, Any] = {"custom_llm_provider": "openai"}
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
+        if self.api_base:
+            kwargs["api_base"] = self.api_base
+        return kwargs
+
+    def submit_batch(
+        self,
+        requests: Dict[str, List[Dict[str, str]]],
+        model: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+    ) -> str:
+        """Submit chat requests to the provider's Batch API.
+        
+        Batches run asynchronously within 24 hours at a lower price than regular
+        calls, which suits offline jobs such as evaluations or bulk labeling.
+        Use poll_batch to collect the responses. Each request is sent with the
+        same parameters as a non-streaming call_llm.
+        
+        Args:
+            requests: Message lists to send, keyed by a custom id
+            model: Optional model override
+            temperature: Sampling temperature, 0 for deterministic answers
+            
+        Returns:
+            The id of the submitted batch
+        """
+        kwargs = self._batch_api_kwargs()
+
+        lines = []
+        for custom_id, messages in requests.items():
+            _, body = self._prepare_call(messages, False, None, model, None, temperature=temperature)
+            for name in LITELLM_ONLY_PARAMS:
+                body.pop(name, None)
+            if body["model"].startswith("openai/"):
+                body["model"] = body["model"][len("openai/"):]
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }, ensure_ascii=False))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        try:
+            input_file = litellm.create_file(file=("batch.jsonl", data), purpose="batch", **kwargs)
+            batch = litellm.create_batch(
+                completion_window="24h",
+                endpoint="/v1/chat/completions",
+                input_file_id=input_file.id,
+                **kwargs,
+            )
+        except Exception as e:
+            logger.error(f"Error submitting LLM batch: {str(e)}", exc_info=True)
+            raise
+
+        logger.info("Submitted LLM batch %s with %d requests", batch.id, len(lines))
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, LLMResponse]]:
+        """Get the responses of a batch submitted with submit_batch.
+        
+        Args:
+            batch_id: The id returned by submit_batch
+            
+        Returns:
+            The responses keyed by custom id, or None if the batch is still running.
+            Requests that failed are left out.
+            
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        kwargs = self._batch_api_kwargs()
+        batch = litellm.retrieve_batch(batch_id=batch_id, **kwargs)
+
+        if batch.status in ("failed", "expired", "cancelled", "cancelling"):
+            raise RuntimeError(f"LLM batch {batch_id} ended with status: {batch.status}")
+        if batch.status != "completed":
+            logger.info("LLM batch %s is %s", batch_id, batch.status)
+            return None
+
+        responses: Dict[str, LLMResponse] = {}
+        if not batch.output_file_id:
+            return responses
+
+        output = litellm.file_content(file_id=batch.output_file_id, **kwargs)
+        for line in output.content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            custom_id = result.get("custom_id")
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                logger.error(f"LLM batch request {custom_id} failed: {result.get('error') or response.get('body')}")
+                continue
+
+            model_response = ModelResponse(**response["body"])
+            responses[custom_id] = LLMResponse(
+                content=model_response.choices[0].message.content or "",
+                tool_calls=self._extract_final(model_response),
+                role="assistant"
+            )
+
+        logger.info("LLM batch %s completed with %d responses", batch_id, len(responses))
+        return responses
+
+    def _finish_streaming_response(self, state: "_StreamState", model: str, params: Dict[str, Any]) -> LLMResponse:
+        """Build and log the final response of a completed stream."""
+        logger.info("Stream complete. Collected %d chunks", state.chunk_count)
+        
+        # Create the final response, with the tool calls merged from all chunks
+        llm_response = LLMResponse(
+            content="".join(state.content_parts),
+            tool_calls=self._extract_streaming(state.tool_call_parts),
+            role="assistant"
+        )
+        
+        # Log the LLM call after completion
+        self._log_llm_call(model, params, llm_response)
+        
+        cache = self._response_cache(params)
+        if cache is not None:
+            cache.set(params, llm_response)
+        
+        return llm_response
+    
+    @staticmethod
+    def _replay_stream(llm_response: LLMResponse) -> Generator[Union[str, LLMResponse], None, None]:
+        """Stream a cached response: its content as one chunk, then the response."""
+        if llm_response.content:
+            yield llm_response.content
+        yield llm_response
+    
+    @staticmethod
+    async def _areplay_stream(llm_response: LLMResponse) -> AsyncGenerator[Union[str, LLMResponse], None]:
+        """Stream a cached response asynchronously, like _replay_stream."""
+        if llm_response.content:
+            yield llm_response.content
+        yield llm_response
+            
+    def _process_stream_chunk(self, state: "_StreamState", chunk: Any) -> Optional[str]:
+        """Add a streaming chunk to the state of its stream.
+        
+        Content is yielded in pieces of at least STREAM_FLUSH_CHARS characters
+        or up to the end of a line, and tool call fragments are collected to be
+        parsed once the stream ends.
+        
+        Args:
+            state: The state of the stream
+            chunk: The chunk received from litellm
+            
+        Returns:
+            The content to yield now, or None if there is nothing to yield yet
+        """
+        state.chunk_count += 1
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            return None
+        # For streaming, we need to check delta instead of message
+        delta = getattr(choices[0], "delta", None)
+        if delta is None:
+            return None
+        
+        # Collect tool call fragments
+        delta_tool_calls = getattr(delta, "tool_calls", None)
+        if delta_tool_calls:
+            self._merge_tool_call_deltas(state.tool_call_parts, delta_tool_calls)
+        
+        # Handle content if present
+        content = getattr(delta, "content", None)
+        if not content:
+            return None
+        state.content_parts.append(content)
+        state.pending.append(content)
+        state.pending_len += len(content)
+        if state.pending_len >= STREAM_FLUSH_CHARS or "\n" in content:
+            return state.flush()
+        return None
+
     def _handle_streaming_response(self, response, model: str, params: Dict[str, Any]) -> Generator[str, None, LLMResponse]:
         """Handle streaming response from litellm."""
-        collected_chunks = []
-        collected_content = ""
+        state = _StreamState()
         
         try:
             for chunk in response:
-                # Extract content from the chunk
-                if hasattr(chunk, "choices") and chunk.choices:
-                    # For streaming, we need to check delta instead of message
-                    if hasattr(chunk.choices[0], 'delta'):
-                        delta = chunk.choices[0].delta
-                        
-                        # Handle content if present
-                        if hasattr(delta, "content") and delta.content:
-                            collected_content += delta.content
-                            yield delta.content
-                
-                # Save the chunk for later processing
-                collected_chunks.append(chunk)
+                content = self._process_stream_chunk(state, chunk)
+                if content:
+                    yield content
+            
+            content = state.flush()
+            if content:
+                yield content
             
             # After stream ends, process the complete response
-            logger.info(f"Stream complete. Collected {len(collected_chunks)} chunks")
+            yield self._finish_streaming_response(state, model, params)
             
-            # Create the final response
-            llm_response = LLMResponse(
-                content=collected_content,
-                tool_calls=None,  # We'll set this later if needed
-                role="assistant"
-            )
+        except Exception as e:
+            logger.error(f"Error in stream processing: {str(e)}", exc_info=True)
+            raise
             
-            # Check if any chunks have tool calls
-            for chunk in collected_chunks:
-                tool_calls = self._extract_tool_calls_from_litellm(chunk)
-                if tool_calls:
-                    llm_response.tool_calls = tool_calls
-                    break
+    async def _ahandle_streaming_response(self, response, model: str, params: Dict[str, Any]) -> AsyncGenerator[Union[str, LLMResponse], None]:
+        """Handle asynchronous streaming response from litellm."""
+        state = _StreamState()
+        
+        try:
+            async for chunk in response:
+                content = self._process_stream_chunk(state, chunk)
+                if content:
+                    yield content
             
-            # Log the LLM call after completion
-            self._log_llm_call(model, params, llm_response)
+            content = state.flush()
+            if content:
+                yield content
             
-            yield llm_response
+            # After stream ends, process the complete response
+            yield self._finish_streaming_response(state, model, params)
             
         except Exception as e:
             logger.error(f"Error in stream processing: {str(e)}", exc_info=True)
@@ -439,7 +1024,7 @@ class LLMClient:
                     content = response.choices[0].message.content or ""
             
             # Extract tool calls from the response
-            tool_calls = self._extract_tool_calls_from_litellm(response)
+            tool_calls = self._extract_final(response)
             
             # Create the response object
             llm_response = LLMResponse(
@@ -451,6 +1036,10 @@ class LLMClient:
             # Log the LLM call
             self._log_llm_call(model, params, llm_response)
             
+            cache = self._response_cache(params)
+            if cache is not None:
+                cache.set(params, llm_response)
+            
             return llm_response
             
         except Exception as e:
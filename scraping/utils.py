@@ -7,24 +7,40 @@ LLM Spider - Web Scraping Utilities
 This module provides utilities for web scraping in the LLM Spider application.
 """
 
+import atexit
 import base64
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, List, Dict, Optional
 
 import requests
+import soupsieve
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from playwright.sync_api import sync_playwright
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Optional dependency, BeautifulSoup is used without it
+    HTMLParser = None
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Shared session, so repeated fetches from the same host reuse pooled connections
+_session = requests.Session()
+_session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+atexit.register(_session.close)
+
 
 def fetch_webpage_html(url: str) -> str:
-    """Fetch the HTML content of a webpage using requests."""
+    """Fetch the HTML content of a webpage using the shared requests session."""
     try:
-        response = requests.get(url, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        response = _session.get(url)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -60,29 +76,182 @@ def take_webpage_screenshot(url: str, timeout: int = 15000) -> Optional[str]:
         return None
 
 
+@lru_cache(maxsize=4)
+def _parse_html(html: str) -> BeautifulSoup:
+    """
+    Parse an HTML document, caching the tree for the most recent documents.
+    
+    The parser designer runs several selectors against the same page while a
+    parser is being designed, so the tree is built once per document and
+    shared. Callers must treat the returned tree as read-only.
+    
+    Args:
+        html: The HTML document
+        
+    Returns:
+        The parsed BeautifulSoup tree
+    """
+    return BeautifulSoup(html, 'html.parser')
+
+
+@lru_cache(maxsize=4)
+def _parse_html_fast(html: str) -> "HTMLParser":
+    """
+    Parse an HTML document with selectolax, caching the most recent trees.
+    
+    Args:
+        html: The HTML document
+        
+    Returns:
+        The parsed selectolax tree
+    """
+    return HTMLParser(html)
+
+
+def _node_values(nodes, attribute: str) -> List[str]:
+    """Extract an attribute (or the text, for 'text') from a list of selectolax nodes."""
+    values = []
+    for node in nodes:
+        if attribute == 'href' and node.tag == 'a':
+            url = node.attributes.get('href')
+            if url:
+                values.append(url)
+        elif attribute == 'text':
+            values.append(node.text().strip())
+        else:
+            attr_value = node.attributes.get(attribute)
+            if attr_value:
+                values.append(attr_value)
+    return values
+
+
+def _element_values(elements, attribute: str) -> List[str]:
+    """Extract an attribute (or the text, for 'text') from a list of elements."""
+    values = []
+    for element in elements:
+        if attribute == 'href' and element.name == 'a':
+            url = element.get('href')
+            if url:
+                values.append(url)
+        elif attribute == 'text':
+            values.append(element.text.strip())
+        else:
+            attr_value = element.get(attribute)
+            if attr_value:
+                values.append(attr_value)
+    return values
+
+
+@lru_cache(maxsize=64)
+def _compile_list_parser(selector: str, attribute: str) -> Callable[[str], List[str]]:
+    """
+    Compile a list page parser into a function of the HTML.
+    
+    The CSS selector is parsed once here rather than on every call. When
+    selectolax is installed it parses the page, and BeautifulSoup is only used
+    for selectors that selectolax rejects.
+    
+    Args:
+        selector: CSS selector of the elements to extract
+        attribute: Attribute to extract, or 'text' for the element text
+        
+    Returns:
+        Function that takes HTML and returns the extracted values
+    """
+    compiled_selector = soupsieve.compile(selector)
+    
+    def parse(html: str) -> List[str]:
+        if HTMLParser is not None:
+            try:
+                return _node_values(_parse_html_fast(html).css(selector), attribute)
+            except Exception as e:
+                logger.debug(f"selectolax failed for selector {selector!r}, using BeautifulSoup: {str(e)}")
+        return _element_values(compiled_selector.select(_parse_html(html)), attribute)
+    
+    return parse
+
+
+@lru_cache(maxsize=64)
+def _compile_content_parser(title_selector: str, date_selector: str, body_selector: str) -> Callable[[str], Dict[str, str]]:
+    """
+    Compile a content page parser into a function of the HTML.
+    
+    The CSS selectors are parsed once here rather than on every call. When
+    selectolax is installed it parses the page, and BeautifulSoup is only used
+    for selectors that selectolax rejects.
+    
+    Args:
+        title_selector: CSS selector of the title, may be empty
+        date_selector: CSS selector of the date, may be empty
+        body_selector: CSS selector of the body, may be empty
+        
+    Returns:
+        Function that takes HTML and returns the title, date and body
+    """
+    fields = [
+        (name, selector, soupsieve.compile(selector) if selector else None)
+        for name, selector in (("title", title_selector), ("date", date_selector), ("body", body_selector))
+    ]
+    
+    def parse(html: str) -> Dict[str, str]:
+        if HTMLParser is not None:
+            try:
+                tree = _parse_html_fast(html)
+                result = {}
+                for name, selector, _ in fields:
+                    node = tree.css_first(selector) if selector else None
+                    result[name] = node.text().strip() if node else ""
+                return result
+            except Exception as e:
+                logger.debug(f"selectolax failed for the content selectors, using BeautifulSoup: {str(e)}")
+        
+        soup = _parse_html(html)
+        result = {}
+        for name, _, compiled_selector in fields:
+            element = compiled_selector.select_one(soup) if compiled_selector else None
+            result[name] = element.text.strip() if element else ""
+        return result
+    
+    return parse
+
+
+def compile_parser(parser_config: Dict[str, Any]) -> Callable[[str], Any]:
+    """
+    Compile a parser configuration into a function of the HTML.
+    
+    Compiled parsers are cached by their selectors, so compiling the same
+    configuration again returns the same function.
+    
+    Args:
+        parser_config: Parser configuration with a 'type' of 'list' (with
+            'selector' and 'attribute') or 'content' (with 'title_selector',
+            'date_selector' and 'body_selector')
+        
+    Returns:
+        Function that takes HTML and returns the parsed result
+        
+    Raises:
+        ValueError: If the parser type is unknown
+    """
+    parser_type = parser_config.get("type", "")
+    if parser_type == "list":
+        return _compile_list_parser(parser_config.get("selector", ""), parser_config.get("attribute", "href"))
+    if parser_type == "content":
+        return _compile_content_parser(
+            parser_config.get("title_selector", ""),
+            parser_config.get("date_selector", ""),
+            parser_config.get("body_selector", "")
+        )
+    raise ValueError(f"Unknown parser type: {parser_type}")
+
+
 def parse_list_page(html: str, selector: str, attribute: str) -> List[str]:
     """Parse a list page to extract URLs."""
     try:
         if not selector:
             return ["Error: No selector provided"]
-            
-        soup = BeautifulSoup(html, 'html.parser')
-        elements = soup.select(selector)
-        urls = []
         
-        for element in elements:
-            if attribute == 'href' and element.name == 'a':
-                url = element.get('href')
-                if url:
-                    urls.append(url)
-            elif attribute == 'text':
-                urls.append(element.text.strip())
-            else:
-                attr_value = element.get(attribute)
-                if attr_value:
-                    urls.append(attr_value)
-        
-        return urls
+        return _compile_list_parser(selector, attribute)(html)
     except Exception as e:
         logger.error(f"Error parsing list page: {str(e)}")
         return [f"Error parsing list page: {str(e)}"]
@@ -91,29 +260,46 @@ def parse_list_page(html: str, selector: str, attribute: str) -> List[str]:
 def parse_content_page(html: str, title_selector: str, date_selector: str, body_selector: str) -> Dict[str, str]:
     """Parse a content page to extract title, date, and body."""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        title = ""
-        date = ""
-        body = ""
-        
-        if title_selector:
-            title_element = soup.select_one(title_selector)
-            title = title_element.text.strip() if title_element else ""
-        
-        if date_selector:
-            date_element = soup.select_one(date_selector)
-            date = date_element.text.strip() if date_element else ""
-        
-        if body_selector:
-            body_element = soup.select_one(body_selector)
-            body = body_element.text.strip() if body_element else ""
-        
-        return {
-            "title": title,
-            "date": date,
-            "body": body
-        }
+        return _compile_content_parser(title_selector, date_selector, body_selector)(html)
     except Exception as e:
         logger.error(f"Error parsing content page: {str(e)}")
-        return {"title": "", "date": "", "body": f"Error: {str(e)}"} 
\ No newline at end of file
+        return {"title": "", "date": "", "body": f"Error: {str(e)}"}
+
+
+def parse_pages(urls: List[str], parser_config: Dict[str, Any], max_workers: int = 8) -> List[Dict[str, Any]]:
+    """
+    Fetch and parse several pages with the same parser configuration.
+    
+    The parser is compiled once for all pages, and the pages are fetched
+    concurrently through the shared session.
+    
+    Args:
+        urls: URLs of the pages to parse
+        parser_config: Parser configuration, as accepted by compile_parser
+        max_workers: Maximum number of pages fetched at the same time
+        
+    Returns:
+        One dictionary per URL, in order, with the 'url' and either the parsed
+        'result' or an 'error'
+    """
+    try:
+        parse = compile_parser(parser_config)
+    except Exception as e:
+        logger.error(f"Error compiling parser: {str(e)}")
+        return [{"url": url, "error": f"Error compiling parser: {str(e)}"} for url in urls]
+    
+    def fetch_and_parse(url: str) -> Dict[str, Any]:
+        html = fetch_webpage_html(url)
+        if html.startswith("Error fetching HTML:"):
+            return {"url": url, "error": html}
+        try:
+            return {"url": url, "result": parse(html)}
+        except Exception as e:
+            logger.error(f"Error parsing {url}: {str(e)}")
+            return {"url": url, "error": f"Error parsing page: {str(e)}"}
+    
+    if not urls:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(fetch_and_parse, urls))
@@ -52,6 +52,61 @@ def test_add_parser():
     
     return created_parser.id
 
+def test_create_many_parsers():
+    """Test adding several URL parsers in one transaction."""
+    print("\n=== Testing create_many() ===")
+    
+    new_parsers = [
+        URLParser(
+            name=f"Bulk Parser {i}",
+            url_pattern=rf"^https?://bulk{i}\.example\.com/.*",
+            parser=f"bulk_parser_{i}",
+            meta_data={"site": f"bulk{i}.example.com"}
+        )
+        for i in range(3)
+    ]
+    
+    names = [parser.name for parser in new_parsers]
+    
+    created_parsers = db_client.create_many(new_parsers)
+    print(f"Added parsers with IDs: {[parser.id for parser in created_parsers]}")
+    assert [parser.name for parser in created_parsers] == names
+    assert all(parser.id is not None for parser in created_parsers)
+    
+    # Clean up
+    for parser in created_parsers:
+        db_client.delete(URLParser, parser.id)
+    
+    return [parser.id for parser in created_parsers]
+
+def test_unit_of_work():
+    """Test running several operations in one transaction."""
+    print("\n=== Testing unit_of_work() ===")
+    
+    # Operations in a unit of work are committed together
+    with db_client.unit_of_work() as session:
+        first = db_client.create(URLParser(name="Unit Parser A", url_pattern=r"^https?://a\.example\.com/", parser="unit_a"))
+        second = db_client.create(URLParser(name="Unit Parser B", url_pattern=r"^https?://b\.example\.com/", parser="unit_b"))
+        assert db_client.get_one(URLParser, name="Unit Parser A").id == first.id
+    print(f"Added parsers with IDs: {first.id}, {second.id}")
+    assert db_client.get_by_id(URLParser, second.id) is not None
+    
+    # A failing unit of work rolls back everything done in it
+    try:
+        with db_client.unit_of_work():
+            db_client.delete(URLParser, first.id)
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert db_client.get_by_id(URLParser, first.id) is not None
+    print("Verified: rolled back unit of work left the parser in place.")
+    
+    # Clean up
+    with db_client.unit_of_work():
+        db_client.delete(URLParser, first.id)
+        db_client.delete(URLParser, second.id)
+    assert db_client.get_by_id(URLParser, first.id) is None
+
 def test_get_parser_by_id(parser_id):
     """Test retrieving a URL parser by ID."""
     print(f"\n=== Testing get_by_id({parser_id}) ===")
@@ -94,6 +149,24 @@ def test_update_parser(parser_id):
     
     return updated_parser
 
+def test_update_unknown_field(parser_id):
+    """Test that updating a field that is not a column is rejected."""
+    print(f"\n=== Testing update({parser_id}) with an unknown field ===")
+    
+    original = db_client.get_by_id(URLParser, parser_id)
+    for returning in (True, False):
+        # Both the UPDATE ... RETURNING path and the load-and-set path
+        db_client.engine.dialect.update_returning = returning
+        try:
+            db_client.update(URLParser, parser_id, name="Renamed", no_such_field=1)
+        except ValueError as e:
+            print(f"Rejected as expected: {e}")
+        else:
+            raise AssertionError("update accepted an unknown field")
+        finally:
+            del db_client.engine.dialect.update_returning
+    assert db_client.get_by_id(URLParser, parser_id).name == original.name
+
 def test_query_parsers():
     """Test querying parsers with filters."""
     print("\n=== Testing query() ===")
@@ -135,12 +208,21 @@ def main():
     # Test adding a new parser
     parser_id = test_add_parser()
     
+    # Test adding several parsers at once
+    test_create_many_parsers()
+    
+    # Test running several operations in one transaction
+    test_unit_of_work()
+    
     # Test getting a parser by ID
     parser = test_get_parser_by_id(parser_id)
     
     # Test querying parsers
     test_query_parsers()
     
+    # Test that unknown fields are rejected
+    test_update_unknown_field(parser_id)
+    
     # Test updating a parser
     updated_parser = test_update_parser(parser_id)
     
@@ -12,6 +12,8 @@ from pathlib import Path
 # Add the parent directory to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from db.db_client import db_client
+from db.models import URLParser
 from db.db_operations import (
     get_all_url_parsers,
     get_url_parser_by_id,
@@ -144,6 +146,56 @@ def test_delete_parser(parser_id):
     else:
         print(f"Verified: Parser with ID {parser_id} no longer exists.")
 
+def test_rolled_back_parser_not_cached():
+    """Test that a parser added in a rolled back unit of work isn't found afterwards."""
+    print("\n=== Testing lookups after a rolled back unit of work ===")
+    url = "rollback-test://example.com/page"
+    count = len(get_all_url_parsers())
+    assert find_parser_for_url(url) is None
+    
+    try:
+        with db_client.unit_of_work():
+            parser = db_client.create(URLParser(name="Rolled Back Parser", url_pattern="rollback-test://", parser="rolled_back"))
+            # The unit of work sees its own parser
+            assert find_parser_for_url(url).id == parser.id
+            assert get_url_parser_by_id(parser.id) is not None
+            assert len(get_all_url_parsers()) == count + 1
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    
+    assert find_parser_for_url(url) is None
+    assert get_url_parser_by_id(parser.id) is None
+    assert len(get_all_url_parsers()) == count
+    print("Verified: the rolled back parser is not found.")
+
+def test_returned_parsers_are_copies():
+    """Test that changing a returned parser doesn't change later lookups."""
+    print("\n=== Testing that returned parsers are copies ===")
+    parser = create_url_parser(
+        name="Copy Test Parser",
+        url_pattern="copy-test://",
+        parser="copy_test",
+        meta_data={"tags": ["a"]}
+    )
+    try:
+        found = get_url_parser_by_id(parser.id)
+        found.name = "Changed"
+        found.meta_data["tags"].append("b")
+        
+        listed = next(p for p in get_all_url_parsers() if p.id == parser.id)
+        listed.url_pattern = "changed://"
+        
+        again = get_url_parser_by_id(parser.id)
+        assert again is not found
+        assert again.name == "Copy Test Parser"
+        assert again.meta_data == {"tags": ["a"]}
+        assert next(p for p in get_all_url_parsers() if p.id == parser.id).url_pattern == "copy-test://"
+        assert find_parser_for_url("copy-test://example.com").name == "Copy Test Parser"
+        print("Verified: changes to returned parsers are not cached.")
+    finally:
+        delete_url_parser(parser.id)
+
 def main():
     """Run the database operations tests."""
     print("=== Starting Database Operations Tests ===")
@@ -157,6 +209,12 @@ def main():
     # Test finding a parser for a URL
     test_find_parser_for_url()
     
+    # Test that rolled back parsers aren't cached
+    test_rolled_back_parser_not_cached()
+    
+    # Test that returned parsers can be changed without affecting the cache
+    test_returned_parsers_are_copies()
+    
     # Test creating a new parser
     parser_id = test_create_parser()
     if parser_id:
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM response cache.
+
+This script checks that only deterministic responses are cached, that they
+are cached by their request parameters, returned as copies, evicted least
+recently used first and expired by TTL.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from llm.cache import LLMCache
+from llm.llm_client import LLMResponse
+
+
+def make_params(content, **overrides):
+    """Build litellm parameters for a single user message."""
+    params = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": content}],
+        "temperature": 0,
+        "max_tokens": 1000,
+        "stream": False,
+    }
+    params.update(overrides)
+    return params
+
+
+def test_cacheable():
+    """Test that only requests with a temperature of 0 may be cached."""
+    print("\n=== Testing cacheable requests ===")
+    assert LLMCache.cacheable(make_params("a"))
+    assert LLMCache.cacheable(make_params("a", temperature=0.0))
+    assert not LLMCache.cacheable(make_params("a", temperature=0.7))
+    
+    params = make_params("a")
+    del params["temperature"]
+    assert not LLMCache.cacheable(params)
+
+
+def test_cache_hit_and_miss():
+    """Test that responses are found by their request parameters."""
+    print("\n=== Testing cache hits and misses ===")
+    cache = LLMCache()
+    response = LLMResponse(content="Paris", tool_calls=[{"name": "f", "arguments": {}}])
+    
+    assert cache.get(make_params("capital of France?")) is None
+    cache.set(make_params("capital of France?"), response)
+    
+    cached = cache.get(make_params("capital of France?"))
+    assert cached == response
+    assert cached is not response
+    
+    # Streaming doesn't change the response, other parameters do
+    assert cache.get(make_params("capital of France?", stream=True)) == response
+    assert cache.get(make_params("capital of France?", temperature=0.7)) is None
+    assert cache.get(make_params("capital of Italy?")) is None
+    assert cache.get(make_params("capital of France?", tools=[{"type": "function"}])) is None
+    
+    # Changing a returned response doesn't change the cached one
+    cached.tool_calls.append({"name": "g"})
+    assert cache.get(make_params("capital of France?")) == response
+    assert cache.hits == 3 and cache.misses == 4
+
+
+def test_lru_eviction():
+    """Test that the least recently used response is evicted first."""
+    print("\n=== Testing LRU eviction ===")
+    cache = LLMCache(max_size=2)
+    cache.set(make_params("a"), LLMResponse(content="A"))
+    cache.set(make_params("b"), LLMResponse(content="B"))
+    assert cache.get(make_params("a")).content == "A"
+    
+    cache.set(make_params("c"), LLMResponse(content="C"))
+    assert len(cache) == 2
+    assert cache.get(make_params("b")) is None
+    assert cache.get(make_params("a")).content == "A"
+    assert cache.get(make_params("c")).content == "C"
+
+
+def test_ttl_expiry():
+    """Test that responses expire after the TTL."""
+    print("\n=== Testing TTL expiry ===")
+    cache = LLMCache(ttl=0.05)
+    cache.set(make_params("a"), LLMResponse(content="A"))
+    assert cache.get(make_params("a")) is not None
+    time.sleep(0.1)
+    assert cache.get(make_params("a")) is None
+    assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    test_cacheable()
+    test_cache_hit_and_miss()
+    test_lru_eviction()
+    test_ttl_expiry()
+    print("\nAll LLM cache tests passed")
@@ -6,7 +6,7 @@ Test script for the new Pydantic-based Function implementation
 """
 
 import json
-from llm.function_manager import FunctionManager
+from llm.function_manager import FunctionManager, get_function_schemas, get_function_schemas_bytes
 from llm.functions import GetWeather
 
 def test_function_schema():
@@ -60,6 +60,11 @@ def test_function_execution():
     except Exception as e:
         print(f"Got expected error: {str(e)}")
     
+    # Test with an already validated input model
+    print("\nTesting with an input model:")
+    result = function(GetWeather.InputModel(location="Tokyo, Japan"))
+    assert result["location"] == "Tokyo, Japan"
+    
     print("Execution tests passed!")
 
 def test_function_manager():
@@ -99,10 +104,47 @@ def test_function_manager():
     
     print("Function Manager tests passed!")
 
+def test_stateless_instance_reuse():
+    """Test that the Function Manager reuses instances of stateless functions."""
+    manager = FunctionManager()
+    
+    manager.execute_function("get_weather", {"location": "Paris, France"})
+    function_class, instance = manager._instance_cache["get_weather"]
+    assert function_class is GetWeather
+    
+    # A second call goes through the same instance
+    result = manager.execute_function("get_weather", {"location": "Berlin, Germany"})
+    assert manager._instance_cache["get_weather"][1] is instance
+    assert "error" not in result
+    
+    # Another manager has its own context, so it creates its own instance
+    other = FunctionManager()
+    other.execute_function("get_weather", {"location": "Rome, Italy"})
+    assert other._instance_cache["get_weather"][1] is not instance
+    
+    # Tool calls without a context share one instance as well
+    tool_call = {"name": "get_weather", "arguments": {"location": "Oslo, Norway"}}
+    FunctionManager.execute_tool_call(tool_call)
+    tool_call_instance = FunctionManager._tool_call_instances["get_weather"][1]
+    FunctionManager.execute_tool_call(tool_call)
+    assert FunctionManager._tool_call_instances["get_weather"][1] is tool_call_instance
+    
+    print("Stateless instance reuse tests passed!")
+
+def test_function_schemas_bytes():
+    """Test that the serialized schemas match the schemas and are built once."""
+    schemas_bytes = get_function_schemas_bytes()
+    assert json.loads(schemas_bytes) == get_function_schemas()
+    assert get_function_schemas_bytes() is schemas_bytes
+    
+    print("Function schema bytes tests passed!")
+
 if __name__ == "__main__":
     print("Testing Pydantic-based Function implementation")
     
     # Run the tests
     test_function_schema()
     test_function_execution()
-    test_function_manager() 
\ No newline at end of file
+    test_function_manager()
+    test_stateless_instance_reuse()
+    test_function_schemas_bytes()
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the URL matcher.
+
+This script checks that the combined URL matcher returns the same parser
+as testing each URL pattern in turn.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add the parent directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.url_matcher import URLMatcher
+
+PATTERNS = [
+    ("github", r"https://github\.com/([^/]+)/([^/]+)/?$"),
+    ("medium", r"https://medium\.com/.*"),
+    ("wenxuecity", r"^https://www\.wenxuecity\.com/news/"),
+    ("news", r"news/\d{4}/\d{2}/\d{2}/\d+\.html"),
+    ("optional_slash", r"^https?://a\.com/?"),
+    ("a_root", r"^https?://a\.com$"),
+    ("b_site", r"^http://b\.org/\w+"),
+    ("any_html", r"\.html$"),
+    ("invalid", r"https://broken\.com/(("),
+    ("backref", r"https://(\w+)\.\1\.com/"),
+]
+
+URLS = [
+    "https://github.com/username/repo",
+    "https://github.com/username/repo/issues",
+    "https://medium.com/some-article",
+    "https://www.wenxuecity.com/news/2025/02/26/126036413.html",
+    "https://example.com/page.html",
+    "https://abc.abc.com/",
+    "https://a.com",
+    "https://a.com.evil.org/",
+    "http://b.org/page",
+    "http://b.org/",
+    "https://www.wenxuecity.com/other.html",
+    "https://example.com/",
+    "",
+]
+
+
+def linear_match(url, anchored):
+    """Reference implementation: test each valid pattern in order."""
+    for key, pattern in PATTERNS:
+        try:
+            rx = re.compile(pattern)
+        except re.error:
+            continue
+        if (rx.match(url) if anchored else rx.search(url)):
+            return key
+    return None
+
+
+def test_matcher_agrees_with_linear_scan():
+    """Test that the matcher returns the first matching pattern."""
+    print("\n=== Testing URLMatcher against a linear scan ===")
+    for anchored in (False, True):
+        # Without the backreference pattern the combined regex is used
+        matcher = URLMatcher(PATTERNS[:-1], anchored=anchored)
+        fallback = URLMatcher(PATTERNS, anchored=anchored)
+        for url in URLS:
+            expected = linear_match(url, anchored)
+            if expected == "backref":
+                assert fallback.match(url) == expected, url
+                continue
+            print(f"  - {url!r} (anchored={anchored}): {expected}")
+            assert matcher.match(url) == expected, url
+            assert fallback.match(url) == expected, url
+
+
+def test_empty_matcher():
+    """Test that an empty matcher matches nothing."""
+    print("\n=== Testing empty URLMatcher ===")
+    matcher = URLMatcher([])
+    assert len(matcher) == 0
+    assert matcher.match("https://github.com/username/repo") is None
+
+
+def test_host_index():
+    """Test that only host-rooted patterns are indexed by host."""
+    print("\n=== Testing URLMatcher host index ===")
+    matcher = URLMatcher(PATTERNS[:-1])
+    indexed = {
+        host: [PATTERNS[i][0] for i, _ in members]
+        for host, members in matcher._patterns.by_host.items()
+    }
+    print(f"  - Indexed hosts: {indexed}")
+    assert indexed == {
+        "www.wenxuecity.com": ["wenxuecity"],
+        "a.com": ["a_root"],
+        "b.org": ["b_site"],
+    }
+
+
+def test_literal_prefilter():
+    """Test that patterns are narrowed by their required literals."""
+    print("\n=== Testing URLMatcher literal prefilter ===")
+    matcher = URLMatcher(PATTERNS[:-1])
+    literals = {
+        PATTERNS[i][0]: literal
+        for i, literal in matcher._patterns.literals.items()
+    }
+    print(f"  - Required literals: {literals}")
+    assert literals["github"] == "https://github.com/"
+    assert literals["optional_slash"] == "://a.com"
+    assert literals["any_html"] == ".html"
+    assert "news" in literals
+
+    alternation = matcher._patterns.alternation_for("https://example.com/page.html")
+    candidates = [PATTERNS[i][0] for i, _ in alternation.members]
+    print(f"  - Candidates for an .html page: {candidates}")
+    assert candidates == ["any_html"]
+
+
+def test_compiled_patterns_are_reused():
+    """Test that matchers with the same patterns share compiled regexes."""
+    print("\n=== Testing compiled pattern reuse ===")
+    first = URLMatcher([("a", r"https://a\.com/"), ("b", r"https://b\.com/")])
+    second = URLMatcher([("x", r"https://a\.com/"), ("y", r"https://b\.com/")])
+    assert first._patterns is second._patterns
+    assert first.match("https://b.com/page") == "b"
+    assert second.match("https://b.com/page") == "y"
+
+
+if __name__ == "__main__":
+    test_matcher_agrees_with_linear_scan()
+    test_empty_matcher()
+    test_host_index()
+    test_literal_prefilter()
+    test_compiled_patterns_are_reused()
+    print("\nAll URL matcher tests passed")
@@ -37,33 +37,89 @@ class ActionButtonDelegate(QtWidgets.QStyledItemDelegate):
         # Calculate total width needed for all buttons
         self.total_width = sum(button.get("width", 80) for button in self.buttons)
         self.total_width += (len(self.buttons) - 1) * 10  # Add spacing
+        
+        # Button style options, built once and reused on every paint
+        self._button_options = []
+        for button_config in self.buttons:
+            button_option = QtWidgets.QStyleOptionButton()
+            button_option.text = button_config.get("label", button_config.get("name", ""))
+            button_option.state = QtWidgets.QStyle.State_Enabled | QtWidgets.QStyle.State_Raised
+            self._button_options.append(button_option)
+        
+        # Button rectangles relative to the cell, keyed by cell size
+        self._button_rects_cache = {}
+        
+        # Rendered buttons, keyed by cell size and device pixel ratio
+        self._pixmap_cache = {}
     
-    def paint(self, painter, option, index):
-        """Paint the delegate."""
-        if index.column() == index.model().columnCount() - 1:  # Last column
-            # Create a widget to hold the buttons
-            widget = QtWidgets.QWidget()
-            layout = QtWidgets.QHBoxLayout(widget)
-            layout.setContentsMargins(4, 4, 4, 4)
-            layout.setSpacing(10)
+    def clear_cache(self):
+        """Drop the rendered buttons, e.g. after a style or palette change."""
+        self._pixmap_cache.clear()
+    
+    def _button_rects(self, rect):
+        """
+        Get the rectangle of each button within a cell.
+        
+        Args:
+            rect: The cell rectangle
             
-            # Add buttons based on configuration
+        Returns:
+            List of QRect objects, one per configured button
+        """
+        size = (rect.width(), rect.height())
+        relative_rects = self._button_rects_cache.get(size)
+        if relative_rects is None:
+            relative_rects = []
+            x_pos = 4
             for button_config in self.buttons:
-                button = QtWidgets.QPushButton(button_config.get("label", button_config.get("name", "")))
-                if "width" in button_config:
-                    button.setFixedWidth(button_config["width"])
-                layout.addWidget(button)
-            
-            # Calculate the size and position
-            widget.setGeometry(option.rect)
+                button_width = button_config.get("width", 80)
+                relative_rects.append(QtCore.QRect(x_pos, 4, button_width, rect.height() - 8))
+                x_pos += button_width + 10
+            self._button_rects_cache[size] = relative_rects
+        
+        return [button_rect.translated(rect.topLeft()) for button_rect in relative_rects]
+    
+    def _buttons_pixmap(self, painter, option):
+        """
+        Get the buttons of a cell rendered into a pixmap.
+        
+        The buttons look the same in every row, so they are drawn once per
+        cell size and the pixmap is reused on later repaints.
+        
+        Args:
+            painter: The painter used to paint the cell
+            option: The style options of the cell
             
-            # Use a pixmap to render the widget
-            pixmap = QtGui.QPixmap(option.rect.size())
+        Returns:
+            QPixmap with the buttons drawn on a transparent background
+        """
+        ratio = painter.device().devicePixelRatioF()
+        key = (option.rect.width(), option.rect.height(), ratio)
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(option.rect.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
             pixmap.fill(Qt.transparent)
-            widget.render(pixmap)
             
-            # Draw the pixmap
-            painter.drawPixmap(option.rect, pixmap)
+            widget = option.widget
+            style = widget.style() if widget else QtWidgets.QApplication.style()
+            
+            # Draw the buttons directly with the style, without creating widgets
+            pixmap_painter = QtGui.QPainter(pixmap)
+            local_rect = QtCore.QRect(QtCore.QPoint(0, 0), option.rect.size())
+            for button_option, button_rect in zip(self._button_options, self._button_rects(local_rect)):
+                button_option.rect = button_rect
+                button_option.palette = option.palette
+                style.drawControl(QtWidgets.QStyle.CE_PushButton, button_option, pixmap_painter, widget)
+            pixmap_painter.end()
+            
+            self._pixmap_cache[key] = pixmap
+        return pixmap
+    
+    def paint(self, painter, option, index):
+        """Paint the delegate."""
+        if index.column() == index.model().columnCount() - 1:  # Last column
+            painter.drawPixmap(option.rect.topLeft(), self._buttons_pixmap(painter, option))
         else:
             super().paint(painter, option, index)
     
@@ -72,24 +128,18 @@ class ActionButtonDelegate(QtWidgets.QStyledItemDelegate):
         if (index.column() == index.model().columnCount() - 1 and 
                 event.type() == QtCore.QEvent.MouseButtonRelease):
             
-            # Get the row ID from the ID column
-            row_id = model.data(model.index(index.row(), self.id_column), Qt.DisplayRole)
-            
-            # Calculate button positions
-            rect = option.rect
-            x_pos = rect.left() + 4
+            # Get the row ID from the ID column, preferring an int from UserRole
+            id_index = model.index(index.row(), self.id_column)
+            row_id = model.data(id_index, Qt.UserRole)
+            if row_id is None:
+                row_id = int(model.data(id_index, Qt.DisplayRole))
             
             # Check which button was clicked
-            for button_config in self.buttons:
-                button_width = button_config.get("width", 80)
-                button_rect = QtCore.QRect(x_pos, rect.top() + 4, button_width, rect.height() - 8)
-                
-                if button_rect.contains(event.position().toPoint()):
-                    self.button_clicked.emit(int(row_id), button_config["name"])
+            pos = event.position().toPoint()
+            for button_config, button_rect in zip(self.buttons, self._button_rects(option.rect)):
+                if button_rect.contains(pos):
+                    self.button_clicked.emit(row_id, button_config["name"])
                     return True
-                
-                # Move to next button position
-                x_pos += button_width + 10
             
         return super().editorEvent(event, model, option, index)
     
@@ -198,6 +248,13 @@ class ActionTableView(QtWidgets.QTableView):
                 # Set the last column to fixed size
                 self.horizontalHeader().setSectionResizeMode(last_column, QtWidgets.QHeaderView.Fixed)
     
+    def changeEvent(self, event):
+        """Re-render the action buttons when the style or palette changes."""
+        if event.type() in (QtCore.QEvent.StyleChange, QtCore.QEvent.PaletteChange):
+            if self.button_delegate:
+                self.button_delegate.clear_cache()
+        super().changeEvent(event)
+    
     def showEvent(self, event):
         """Handle the show event to apply percentage-based column widths."""
         super().showEvent(event)
@@ -293,41 +350,21 @@ class ActionTableWidget(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        # Create scroll area
-        scroll_area = QtWidgets.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        # Set horizontal scroll policy based on configuration
-        if self.config.get('allow_horizontal_scroll', False):
-            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        else:
-            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        # Create table container
-        table_container = QtWidgets.QWidget()
-        table_layout = QtWidgets.QVBoxLayout(table_container)
-        table_layout.setContentsMargins(0, 0, 0, 0)  # Remove margins to prevent horizontal scrollbar
-        
-        # Create table view
+        # Create table view; it scrolls its own viewport, so only the
+        # visible rows are laid out and painted
         self.table_view = ActionTableView(
             parent=self,
             config=self.config
         )
+        self.table_view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
         self.table_view.action_triggered.connect(self.action_triggered)
         
         # Set the model if provided
         if self.model:
             self.table_view.setModel(self.model)
         
-        # Add table to container
-        table_layout.addWidget(self.table_view)
-        
-        # Set container as scroll area widget
-        scroll_area.setWidget(table_container)
-        
-        # Add scroll area to main layout
-        layout.addWidget(scroll_area)
+        # Add table to main layout
+        layout.addWidget(self.table_view)
     
     def setModel(self, model):
         """Set the model for the table view."""
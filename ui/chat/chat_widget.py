@@ -259,6 +259,10 @@ class ChatWidget(QtWidgets.QWidget):
         self.history.clear()
         self.chat_display.clear()
     
+    def start_new_log(self):
+        """Write the chat content to a new log file from now on."""
+        self._setup_logging()
+    
     def set_processing(self, is_processing: bool):
         """Enable or disable input during processing."""
         self.is_processing = is_processing
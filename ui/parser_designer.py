@@ -33,7 +33,7 @@ class ParserDesignerWindow(QtWidgets.QDialog):
     """Dialog for designing URL parsers with LLM assistance."""
     
     # Signal to notify when a parser is saved
-    parser_saved = QtCore.Signal()
+    parser_saved = QtCore.Signal(int)  # parser id
     
     # State constants (kept for reference but state transitions handled by LLM)
     STATE_WAITING_FOR_URL = "S1"
@@ -51,6 +51,43 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         # Make the dialog non-modal
         self.setWindowModality(Qt.NonModal)
         
+        # Set up function manager
+        self.function_manager = FunctionManager(parser_designer=self)
+        
+        # Set up LLM worker in a separate thread
+        self.worker_thread = QThread()
+        self.llm_worker = LLMWorker()
+        self.llm_worker.moveToThread(self.worker_thread)
+        
+        # Connect signals
+        self.llm_worker.response_received.connect(self.on_llm_response)
+        self.llm_worker.chunk_received.connect(self.on_llm_chunk)
+        self.llm_worker.function_call_received.connect(self.on_function_call)
+        self.llm_worker.error_occurred.connect(self.on_llm_error)
+        self.llm_worker.finished.connect(self.on_llm_finished)
+        
+        # Per-function hooks for LLM function calls, by function name: argument
+        # preparation before the call and UI updates from the response after it
+        self._function_args_handlers = {
+            "parse_webpage": self._prepare_parse_webpage_args,
+        }
+        self._function_response_handlers = {
+            "parse_webpage": self._handle_parse_webpage_response,
+        }
+        
+        self._reset_state(parser_id, url)
+        self.setup_ui()
+        self.setup_signals()
+        
+        # Set window properties
+        self.setWindowTitle("Parser Designer")
+        self.resize(800, 600)
+        
+        # Load the parser and initialize chat
+        self.load(parser_id, url)
+    
+    def _reset_state(self, parser_id=None, url=None):
+        """Reset the per-parser state of the designer."""
         self.parser_id = parser_id
         self.parser = None
         self.chat_history = ChatHistory()
@@ -63,59 +100,96 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         
         # Parser data
         self.html_content = None
+        self.html_preview = None
         self.parser_config = {}
         self.parsed_results = None
         
         # Pending parse request data
         self.pending_parse_url = None
+    
+    def _load_parser(self, parser_id):
+        """Load a parser and its saved chat state from the database."""
+        self.parser = db_client.get_by_id(URLParser, parser_id)
+        if self.parser and self.parser.chat_data:
+            # Load chat history if available
+            try:
+                if isinstance(self.parser.chat_data, str):
+                    chat_data = json.loads(self.parser.chat_data)
+                else:
+                    chat_data = self.parser.chat_data
+                
+                if "chat_history" in chat_data:
+                    self.chat_history = ChatHistory.from_dict(chat_data["chat_history"])
+                if "memory" in chat_data:
+                    self.memory = chat_data["memory"]
+                if "state" in chat_data:
+                    self.current_state = chat_data["state"]
+            except Exception as e:
+                logger.error(f"Failed to load chat history: {str(e)}")
+    
+    def load(self, parser_id=None, url=None):
+        """
+        Load a parser into the designer, replacing the current session.
+        
+        The window, its widgets and the LLM worker are reused, so one designer
+        can be shown for any number of parsers. While the window is open, the
+        current session is kept if the assistant is still responding or the
+        user chooses to keep an unsaved chat.
+        
+        Args:
+            parser_id: ID of the parser to edit, or None to design a new parser
+            url: Optional URL to analyze
+        """
+        if self.isVisible() and not self._can_replace_session():
+            return
         
-        # Set up function manager
-        self.function_manager = FunctionManager(parser_designer=self)
-        
-        # Set up LLM worker in a separate thread
-        self.worker_thread = QThread()
-        self.llm_worker = LLMWorker()
-        self.llm_worker.moveToThread(self.worker_thread)
-        
-        # Connect signals
-        self.llm_worker.response_received.connect(self.on_llm_response)
-        self.llm_worker.chunk_received.connect(self.on_llm_chunk)
-        self.llm_worker.function_call_received.connect(self.on_function_call)
-        self.llm_worker.error_occurred.connect(self.on_llm_error)
-        self.llm_worker.finished.connect(self.on_llm_finished)
+        self._reset_state(parser_id, url)
         
-        # Start the worker thread
-        self.worker_thread.start()
+        # The worker thread is stopped when the window is closed
+        if not self.worker_thread.isRunning():
+            self.worker_thread.start()
         
         # Load parser if editing
         if parser_id:
-            self.parser = db_client.get_by_id(URLParser, parser_id)
-            if self.parser and self.parser.chat_data:
-                # Load chat history if available
-                try:
-                    if isinstance(self.parser.chat_data, str):
-                        chat_data = json.loads(self.parser.chat_data)
-                    else:
-                        chat_data = self.parser.chat_data
-                    
-                    if "chat_history" in chat_data:
-                        self.chat_history = ChatHistory.from_dict(chat_data["chat_history"])
-                    if "memory" in chat_data:
-                        self.memory = chat_data["memory"]
-                    if "state" in chat_data:
-                        self.current_state = chat_data["state"]
-                except Exception as e:
-                    logger.error(f"Failed to load chat history: {str(e)}")
+            self._load_parser(parser_id)
         
-        self.setup_ui()
-        self.setup_signals()
+        # Update UI with parser data
+        self.name_input.setText(self.parser.name if self.parser else "")
+        self.url_input.setText(self.url or "")
+        self.chat_widget.clear_chat()
+        self.chat_widget.set_processing(False)
+        self.chat_widget.start_new_log()
         
-        # Set window properties
-        self.setWindowTitle("Parser Designer")
-        self.resize(800, 600)
+        if self.parser:
+            # Load chat history
+            for message in self.chat_history.messages:
+                if message.role != ChatMessage.ROLE_SYSTEM:
+                    self.chat_widget.display_message(message)
         
         # Initialize chat with system prompt
         self._initialize_chat()
+        self._saved_message_count = len(self.chat_widget.history.messages)
+    
+    def _can_replace_session(self):
+        """Check that the current session may be replaced by another parser."""
+        if self.chat_widget.is_processing:
+            # The response of a running LLM call would land in the new session
+            QtWidgets.QMessageBox.warning(
+                self, "Parser Designer Busy",
+                "The assistant is still responding. Please wait for it to finish "
+                "before opening another parser."
+            )
+            return False
+        
+        if len(self.chat_widget.history.messages) != self._saved_message_count:
+            reply = QtWidgets.QMessageBox.question(
+                self, "Discard Chat?",
+                "The current chat has not been saved. Discard it and open another parser?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
+            )
+            return reply == QtWidgets.QMessageBox.Yes
+        
+        return True
     
     def setup_ui(self):
         """Set up the UI components."""
@@ -128,8 +202,6 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         name_layout = QtWidgets.QHBoxLayout()
         name_label = QtWidgets.QLabel("Name:")
         self.name_input = QtWidgets.QLineEdit()
-        if self.parser:
-            self.name_input.setText(self.parser.name)
         name_layout.addWidget(name_label)
         name_layout.addWidget(self.name_input)
         header_layout.addLayout(name_layout, 2)
@@ -150,8 +222,6 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         url_layout = QtWidgets.QHBoxLayout()
         url_label = QtWidgets.QLabel("URL:")
         self.url_input = QtWidgets.QLineEdit()
-        if self.url:
-            self.url_input.setText(self.url)
         url_layout.addWidget(url_label)
         url_layout.addWidget(self.url_input)
         toolbar_layout.addLayout(url_layout, 3)
@@ -175,13 +245,6 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         )
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
-        
-        # Update UI with parser data if editing
-        if self.parser:
-            # Load chat history
-            for message in self.chat_history.messages:
-                if message.role != ChatMessage.ROLE_SYSTEM:
-                    self.chat_widget.display_message(message)
     
     def setup_signals(self):
         """Set up signal connections."""
@@ -406,9 +469,10 @@ class ParserDesignerWindow(QtWidgets.QDialog):
     
     def on_function_call(self, function_name, function_args):
         """Handle a function call from the LLM."""
-        # Add state information to function arguments
-        if function_name == "parse_webpage":
-            function_args["state"] = self.current_state
+        # Add function-specific information to the arguments
+        prepare_args = self._function_args_handlers.get(function_name)
+        if prepare_args is not None:
+            prepare_args(function_args)
         
         # Execute the function through the function manager
         function_response = self.function_manager.execute_function(function_name, function_args)
@@ -420,44 +484,53 @@ class ParserDesignerWindow(QtWidgets.QDialog):
         ))
         
         # Handle state transitions and memory updates based on function response
-        if function_name == "parse_webpage":
-            if "error" in function_response:
-                # Handle error by transitioning to recovery state
-                self._handle_state_transition(self.STATE_RECOVERY)
-                self.chat_widget.chat_display.append(
-                    f'<div style="color: red; padding: 10px; border-radius: 5px; margin: 10px 0;">'
-                    f'Error: {function_response["error"]}</div>'
-                )
-            elif "status" in function_response and function_response["status"] == "success":
-                # Display success message if provided
-                if "message" in function_response:
-                    self.chat_widget.chat_display.append(
-                        f'<div style="color: #008800; font-style: italic;">'
-                        f'{function_response["message"]}</div>'
-                    )
-                
-                # Handle HTML preview if available
-                if "html_preview" in function_response:
-                    self.chat_widget.chat_display.append(
-                        f'<div style="background-color: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">'
-                        f'<p><strong>HTML Content Preview:</strong></p>'
-                        f'<pre style="white-space: pre-wrap;">{function_response["html_preview"]}</pre>'
-                        f'<p>Total length: {function_response.get("html_length", 0)} characters</p>'
-                        f'</div>'
-                    )
-                
-                # Handle parsing results if available
-                if "parsing_result" in function_response:
-                    self.chat_widget.chat_display.append(
-                        f'<div style="background-color: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">'
-                        f'<p><strong>Parsing Result:</strong></p>'
-                        f'<pre style="white-space: pre-wrap;">{json.dumps(function_response["parsing_result"], indent=2)}</pre>'
-                        f'</div>'
-                    )
+        handle_response = self._function_response_handlers.get(function_name)
+        if handle_response is not None:
+            handle_response(function_response)
         
         # Call the LLM again with the updated chat history
         self.llm_worker.call_llm(self.chat_widget.history.get_openai_messages(), function_schemas=get_function_schemas())
     
+    def _prepare_parse_webpage_args(self, function_args):
+        """Add state information to parse_webpage arguments."""
+        function_args["state"] = self.current_state
+    
+    def _handle_parse_webpage_response(self, function_response):
+        """Show the result of a parse_webpage call and handle errors."""
+        if "error" in function_response:
+            # Handle error by transitioning to recovery state
+            self._handle_state_transition(self.STATE_RECOVERY)
+            self.chat_widget.chat_display.append(
+                f'<div style="color: red; padding: 10px; border-radius: 5px; margin: 10px 0;">'
+                f'Error: {function_response["error"]}</div>'
+            )
+        elif "status" in function_response and function_response["status"] == "success":
+            # Display success message if provided
+            if "message" in function_response:
+                self.chat_widget.chat_display.append(
+                    f'<div style="color: #008800; font-style: italic;">'
+                    f'{function_response["message"]}</div>'
+                )
+            
+            # Handle HTML preview if available
+            if "html_preview" in function_response:
+                self.chat_widget.chat_display.append(
+                    f'<div style="background-color: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">'
+                    f'<p><strong>HTML Content Preview:</strong></p>'
+                    f'<pre style="white-space: pre-wrap;">{function_response["html_preview"]}</pre>'
+                    f'<p>Total length: {function_response.get("html_length", 0)} characters</p>'
+                    f'</div>'
+                )
+            
+            # Handle parsing results if available
+            if "parsing_result" in function_response:
+                self.chat_widget.chat_display.append(
+                    f'<div style="background-color: #f5f5f5; padding: 10px; border-radius: 5px; margin: 10px 0;">'
+                    f'<p><strong>Parsing Result:</strong></p>'
+                    f'<pre style="white-space: pre-wrap;">{json.dumps(function_response["parsing_result"], indent=2)}</pre>'
+                    f'</div>'
+                )
+    
     def on_llm_error(self, error_message):
         """Handle an error from the LLM."""
         # Remove the "typing" indicator
@@ -762,11 +835,12 @@ class ParserDesignerWindow(QtWidgets.QDialog):
                 created_parser = db_client.create(self.parser)
                 if created_parser:
                     self.parser = created_parser
+                    self._saved_message_count = len(self.chat_widget.history.messages)
                     QtWidgets.QMessageBox.information(
                         self, "Success", f"Parser '{name}' created successfully."
                     )
                     self.accept()  # Close the dialog
-                    self.parser_saved.emit()
+                    self.parser_saved.emit(self.parser.id)
                 else:
                     QtWidgets.QMessageBox.critical(
                         self, "Error", "Failed to create parser."
@@ -777,21 +851,24 @@ class ParserDesignerWindow(QtWidgets.QDialog):
                 )
         else:
             # Update existing parser
-            self.parser.name = name
-            self.parser.url_pattern = url_pattern
-            self.parser.parser = json.dumps(parser_data)
-            self.parser.meta_data = meta_data
-            self.parser.chat_data = chat_data
-            
             try:
-                updated_parser = db_client.update(self.parser)
+                updated_parser = db_client.update(
+                    URLParser,
+                    self.parser.id,
+                    name=name,
+                    url_pattern=url_pattern,
+                    parser=json.dumps(parser_data),
+                    meta_data=meta_data,
+                    chat_data=chat_data
+                )
                 if updated_parser:
                     self.parser = updated_parser
+                    self._saved_message_count = len(self.chat_widget.history.messages)
                     QtWidgets.QMessageBox.information(
                         self, "Success", f"Parser '{name}' updated successfully."
                     )
                     self.accept()  # Close the dialog
-                    self.parser_saved.emit()
+                    self.parser_saved.emit(self.parser.id)
                 else:
                     QtWidgets.QMessageBox.critical(
                         self, "Error", "Failed to update parser."
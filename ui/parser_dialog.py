@@ -10,11 +10,70 @@ A dialog for creating or editing URL parsers.
 from PySide6 import QtWidgets, QtCore, QtGui
 from PySide6.QtCore import Qt, Signal, Slot
 import json
+from functools import lru_cache
+
+# Use orjson for parsing when available; it raises a json.JSONDecodeError subclass
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from db.db_client import db_client
 from db.models import URLParser
 
 
+@lru_cache(maxsize=128)
+def _pretty_json_text(text):
+    """
+    Pretty-print a JSON document, caching the result by its source text.
+    
+    Args:
+        text: JSON text as stored in the database
+        
+    Returns:
+        The document formatted with an indent of 2, or the text unchanged
+        if it is not valid JSON
+    """
+    try:
+        return json.dumps(_json_loads(text), indent=2)
+    except (json.JSONDecodeError, TypeError):
+        return text
+
+
+def _pretty_json(value):
+    """
+    Format a JSON column value for display in the dialog.
+    
+    JSON text is formatted through the cache keyed by the text; decoded
+    objects are formatted directly with a single dump.
+    
+    Args:
+        value: The column value, either JSON text or an already decoded object
+        
+    Returns:
+        The pretty-printed JSON text
+    """
+    if isinstance(value, str):
+        return _pretty_json_text(value)
+    return json.dumps(value, indent=2)
+
+
+def _decode_json(value):
+    """
+    Decode a JSON column value loaded into the dialog.
+    
+    Args:
+        value: The column value, either JSON text or an already decoded object
+        
+    Returns:
+        The decoded object
+    """
+    if isinstance(value, str):
+        return _json_loads(value)
+    return value
+
+
 class ParserDialog(QtWidgets.QDialog):
     """Dialog for creating or editing a URL parser."""
     
@@ -22,6 +81,8 @@ class ParserDialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.parser_id = parser_id
         self.parser = None
+        # Text shown in each JSON field when loaded, keyed by field name
+        self._loaded_json_text = {}
         
         if parser_id:
             self.setWindowTitle("Edit URL Parser")
@@ -79,10 +140,34 @@ class ParserDialog(QtWidgets.QDialog):
             self.parser_input.setText(self.parser.parser)
             
             if self.parser.meta_data:
-                self.meta_input.setText(json.dumps(self.parser.meta_data, indent=2))
+                self._loaded_json_text['meta_data'] = _pretty_json(self.parser.meta_data)
+                self.meta_input.setText(self._loaded_json_text['meta_data'])
                 
             if self.parser.chat_data:
-                self.chat_input.setText(json.dumps(self.parser.chat_data, indent=2))
+                self._loaded_json_text['chat_data'] = _pretty_json(self.parser.chat_data)
+                self.chat_input.setText(self._loaded_json_text['chat_data'])
+    
+    def _json_field_value(self, field, text):
+        """
+        Decode the text of a JSON field.
+        
+        A field left as loaded is decoded from the stored value, which is
+        compact and known to be valid, instead of re-parsing the
+        pretty-printed text.
+        
+        Args:
+            field: Name of the parser column the field edits
+            text: Stripped text of the field
+            
+        Returns:
+            The decoded object
+            
+        Raises:
+            json.JSONDecodeError: If the text is not valid JSON
+        """
+        if self.parser and text == self._loaded_json_text.get(field, '').strip():
+            return _decode_json(getattr(self.parser, field))
+        return _json_loads(text)
     
     def get_parser_data(self):
         """Get the parser data from the form fields."""
@@ -97,7 +182,7 @@ class ParserDialog(QtWidgets.QDialog):
         meta_text = self.meta_input.toPlainText().strip()
         if meta_text:
             try:
-                data['meta_data'] = json.loads(meta_text)
+                data['meta_data'] = self._json_field_value('meta_data', meta_text)
             except json.JSONDecodeError:
                 QtWidgets.QMessageBox.warning(
                     self, "Invalid JSON", "Meta Data contains invalid JSON."
@@ -107,7 +192,7 @@ class ParserDialog(QtWidgets.QDialog):
         chat_text = self.chat_input.toPlainText().strip()
         if chat_text:
             try:
-                data['chat_data'] = json.loads(chat_text)
+                data['chat_data'] = self._json_field_value('chat_data', chat_text)
             except json.JSONDecodeError:
                 QtWidgets.QMessageBox.warning(
                     self, "Invalid JSON", "Chat Data contains invalid JSON."
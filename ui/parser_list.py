@@ -7,20 +7,57 @@ LLM Spider - URL Parser List Window
 The main window for managing URL parsers.
 """
 
-import re
 from PySide6 import QtWidgets, QtCore, QtGui
-from PySide6.QtCore import Qt, Signal, Slot
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QRunnable, QThreadPool
 
 from db.db_client import db_client
 from db.models import URLParser
-from parser_designer import ParserDesignerWindow
 from ui.action_table import ActionTableWidget
 from ui.parser_table_model import URLParserTableModel
 
 
+class URLScanSignals(QObject):
+    """Signals emitted by a URLScanWorker."""
+    
+    finished = Signal(str, object)  # url, matching parser or None
+
+
+class URLScanWorker(QRunnable):
+    """
+    Worker that matches a URL against the parser URL patterns in a thread pool.
+    
+    The worker only uses the URL matcher and never touches Qt widgets; the
+    result is delivered to the GUI thread through its signals.
+    """
+    
+    def __init__(self, url, matcher):
+        """
+        Initialize the worker.
+        
+        Args:
+            url: The URL to match
+            matcher: URLMatcher built from the current parsers
+        """
+        super().__init__()
+        self.url = url
+        self.matcher = matcher
+        self.signals = URLScanSignals()
+    
+    def run(self):
+        """Match the URL and emit the result."""
+        parser = None
+        try:
+            parser = self.matcher.match(self.url)
+        finally:
+            self.signals.finished.emit(self.url, parser)
+
+
 class ParserListWindow(QtWidgets.QMainWindow):
     """Main application window for managing URL parsers."""
     
+    # Delay before a Parse request runs; repeated requests restart it
+    PARSE_DEBOUNCE_MS = 150
+    
     def __init__(self):
         super().__init__()
         
@@ -40,12 +77,13 @@ class ParserListWindow(QtWidgets.QMainWindow):
         self.url_input = QtWidgets.QLineEdit()
         self.url_input.setPlaceholderText("Enter URL to parse...")
         self.url_input.setText("https://www.wenxuecity.com/news/2025/02/26/126036413.html")
+        self.url_input.returnPressed.connect(self.parse_url)
         top_bar.addWidget(self.url_input, 3)
         
         # Parse button
-        parse_button = QtWidgets.QPushButton("Parse")
-        parse_button.clicked.connect(self.parse_url)
-        top_bar.addWidget(parse_button, 1)
+        self.parse_button = QtWidgets.QPushButton("Parse")
+        self.parse_button.clicked.connect(self.parse_url)
+        top_bar.addWidget(self.parse_button, 1)
         
         # New Parser button
         new_parser_button = QtWidgets.QPushButton("New Parser")
@@ -95,6 +133,40 @@ class ParserListWindow(QtWidgets.QMainWindow):
         
         # Status bar
         self.statusBar().showMessage("Ready")
+        
+        # URL matching runs in the global thread pool; a URL submitted while a
+        # scan is running is kept and scanned when that scan finishes
+        self._scan_worker = None
+        self._pending_scan_url = None
+        
+        # Coalesce rapid Parse clicks and Enter presses into a single scan
+        self._parse_timer = QtCore.QTimer(self)
+        self._parse_timer.setSingleShot(True)
+        self._parse_timer.setInterval(self.PARSE_DEBOUNCE_MS)
+        self._parse_timer.timeout.connect(self._do_parse)
+        
+        # The parser designer pulls in the LLM stack, so it is imported and
+        # created on first use and then reused for every parser
+        self._designer = None
+    
+    def open_designer(self, parser_id=None, url=None):
+        """
+        Show the parser designer for a parser.
+        
+        Args:
+            parser_id: ID of the parser to edit, or None to create a new parser
+            url: Optional URL to analyze
+        """
+        if self._designer is None:
+            from ui.parser_designer import ParserDesignerWindow
+            self._designer = ParserDesignerWindow(self, parser_id, url=url)
+            self._designer.parser_saved.connect(self.model.upsert_parser)
+        else:
+            self._designer.load(parser_id, url=url)
+        
+        self._designer.show()
+        self._designer.raise_()
+        self._designer.activateWindow()
     
     def handle_action(self, row_id, action_name):
         """Handle action button clicks from the table."""
@@ -104,22 +176,52 @@ class ParserListWindow(QtWidgets.QMainWindow):
             self.delete_parser(row_id)
     
     def parse_url(self):
+        """Parse the URL entered in the input field once input settles."""
+        self._parse_timer.start()
+    
+    def _do_parse(self):
         """Parse the URL entered in the input field."""
         url = self.url_input.text()
         if not url:
             self.statusBar().showMessage("Please enter a URL to parse")
             return
+        
+        if self._scan_worker is not None:
+            # A scan is already running for an earlier request; scan this URL
+            # once it finishes
+            self._pending_scan_url = url
+            return
+        
+        self._start_scan(url)
+    
+    def _start_scan(self, url):
+        """Find a matching parser for a URL off the GUI thread."""
+        self.parse_button.setEnabled(False)
+        self.statusBar().showMessage(f"Looking for a parser for URL: {url}")
+        self._scan_worker = URLScanWorker(url, self.model.matcher)
+        self._scan_worker.signals.finished.connect(self._on_scan_finished)
+        QThreadPool.globalInstance().start(self._scan_worker)
+    
+    @Slot(str, object)
+    def _on_scan_finished(self, url, parser):
+        """Open the parser designer for the result of a URL scan."""
+        self._scan_worker = None
+        
+        pending_url, self._pending_scan_url = self._pending_scan_url, None
+        if pending_url is not None and pending_url != url:
+            # The URL was submitted again after this scan started; the result
+            # for the earlier URL is no longer wanted
+            self._start_scan(pending_url)
+            return
+        
+        self.parse_button.setEnabled(True)
+        
+        if parser is not None:
+            self.statusBar().showMessage(f"Found matching parser: {parser.name}")
             
-        # Find a matching parser for the URL
-        for parser in self.model.parsers:
-            if re.search(parser.url_pattern, url):
-                self.statusBar().showMessage(f"Found matching parser: {parser.name}")
-                
-                # Open the parser designer for this parser
-                designer = ParserDesignerWindow(self, parser.id, url=url)
-                designer.parser_saved.connect(self.model.refresh_data)
-                designer.show()
-                return
+            # Open the parser designer for this parser
+            self.open_designer(parser.id, url=url)
+            return
         
         # No matching parser found
         self.statusBar().showMessage(f"No matching parser found for URL: {url}")
@@ -132,22 +234,16 @@ class ParserListWindow(QtWidgets.QMainWindow):
         )
         
         if reply == QtWidgets.QMessageBox.Yes:
-            designer = ParserDesignerWindow(self, url=url)
-            designer.parser_saved.connect(self.model.refresh_data)
-            designer.show()
+            self.open_designer(url=url)
     
     def create_parser(self):
         """Open dialog to create a new parser."""
         url = self.url_input.text().strip()
-        designer = ParserDesignerWindow(self, url=url)
-        designer.parser_saved.connect(self.model.refresh_data)
-        designer.show()
+        self.open_designer(url=url)
     
     def edit_parser(self, parser_id):
         """Open dialog to edit an existing parser."""
-        designer = ParserDesignerWindow(self, parser_id)
-        designer.parser_saved.connect(self.model.refresh_data)
-        designer.show()
+        self.open_designer(parser_id)
     
     def delete_parser(self, parser_id):
         """Delete a parser after confirmation."""
@@ -160,7 +256,7 @@ class ParserListWindow(QtWidgets.QMainWindow):
         if confirm == QtWidgets.QMessageBox.Yes:
             try:
                 db_client.delete(URLParser, parser_id)
-                self.table_widget.refresh()
+                self.model.remove_parser(parser_id)
                 self.statusBar().showMessage(f"Deleted parser ID: {parser_id}")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(
@@ -169,10 +265,9 @@ class ParserListWindow(QtWidgets.QMainWindow):
     
     def closeEvent(self, event):
         """Handle the window close event to ensure all resources are properly cleaned up."""
-        # Find and close all child windows
-        for child in self.findChildren(QtWidgets.QWidget):
-            if isinstance(child, ParserDesignerWindow) and child.isVisible():
-                child.close()
+        # Close the parser designer if it is open
+        if self._designer is not None and self._designer.isVisible():
+            self._designer.close()
         
         # Accept the event
         event.accept() 
\ No newline at end of file
@@ -7,54 +7,202 @@ LLM Spider - URL Parser Table Model
 A table model for displaying URL parsers in a table view.
 """
 
+from operator import attrgetter
+
 from PySide6 import QtCore
 from PySide6.QtCore import Qt
 
 from db.db_client import db_client
 from db.models import URLParser
+from utils.url_matcher import URLMatcher
 
 
 class URLParserTableModel(QtCore.QAbstractTableModel):
     """Model for displaying URL parsers in a table view."""
     
+    # Number of rows handed to the view at a time as the user scrolls
+    FETCH_BATCH_SIZE = 50
+    
+    # Columns loaded for the table, in display order
+    COLUMNS = (URLParser.id, URLParser.name, URLParser.url_pattern, URLParser.parser)
+    
+    # How the value of each (role, column) pair the model answers is
+    # computed from a parser row; every other pair has no data
+    ROLE_VALUES = {
+        (Qt.DisplayRole, 0): lambda parser: str(parser.id),
+        (Qt.DisplayRole, 1): attrgetter("name"),
+        (Qt.DisplayRole, 2): attrgetter("url_pattern"),
+        (Qt.DisplayRole, 3): attrgetter("parser"),
+        # The parser ID as an int, used by the action buttons
+        (Qt.UserRole, 0): attrgetter("id"),
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parsers = []
+        self._values = {key: [] for key in self.ROLE_VALUES}
+        self._row_count = 0
+        self._matcher = URLMatcher([])
         self.headers = ["ID", "Name", "URL Pattern", "Parser", "Actions"]
         self.refresh_data()
     
     def refresh_data(self):
         """Refresh data from the database."""
         self.beginResetModel()
-        self.parsers = db_client.get_all(URLParser)
+        # Values are computed up front and kept per (role, column) pair, so
+        # data() is a dict lookup followed by a list lookup
+        self.parsers = []
+        self._values = {key: [] for key in self.ROLE_VALUES}
+        for parser in db_client.get_rows(*self.COLUMNS, order_by=URLParser.id):
+            self._set_row(len(self.parsers), parser)
+        self._rebuild_matcher()
+        self._row_count = min(len(self.parsers), self.FETCH_BATCH_SIZE)
         self.endResetModel()
     
+    def _row_of(self, parser_id):
+        """Return the row index of a parser, or None if it is not loaded."""
+        for row, parser in enumerate(self.parsers):
+            if parser.id == parser_id:
+                return row
+        return None
+    
+    def _rebuild_matcher(self):
+        """Rebuild the URL matcher after the list of parsers changed."""
+        self._matcher = URLMatcher((p, p.url_pattern) for p in self.parsers)
+    
+    def _set_row(self, row, parser):
+        """Store a parser row, appending it when row is past the end."""
+        if row == len(self.parsers):
+            self.parsers.append(parser)
+            for key, values in self._values.items():
+                values.append(self.ROLE_VALUES[key](parser))
+        else:
+            self.parsers[row] = parser
+            for key, values in self._values.items():
+                values[row] = self.ROLE_VALUES[key](parser)
+    
+    def _delete_row(self, row):
+        """Delete a stored parser row."""
+        del self.parsers[row]
+        for values in self._values.values():
+            del values[row]
+    
+    def upsert_parser(self, parser_id):
+        """
+        Reload a single parser from the database and update its row.
+        
+        A parser that is not loaded yet is appended as a new row.
+        
+        Args:
+            parser_id: ID of the parser that was created or updated
+        """
+        rows = db_client.get_rows(*self.COLUMNS, criteria=(URLParser.id == parser_id,))
+        if not rows:
+            self.remove_parser(parser_id)
+            return
+        parser = rows[0]
+        
+        row = self._row_of(parser_id)
+        if row is None:
+            row = len(self.parsers)
+            if self._row_count == row:
+                # All rows are shown, so the new row becomes visible right away
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self._set_row(row, parser)
+                self._row_count += 1
+                self.endInsertRows()
+            else:
+                self._set_row(row, parser)
+        else:
+            self._set_row(row, parser)
+            if row < self._row_count:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.headers) - 1))
+        
+        self._rebuild_matcher()
+    
+    def remove_parser(self, parser_id):
+        """
+        Remove the row of a deleted parser.
+        
+        Args:
+            parser_id: ID of the parser that was deleted
+        """
+        row = self._row_of(parser_id)
+        if row is None:
+            return
+        
+        if row < self._row_count:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            self._delete_row(row)
+            self._row_count -= 1
+            self.endRemoveRows()
+        else:
+            self._delete_row(row)
+        
+        self._rebuild_matcher()
+    
+    @property
+    def matcher(self):
+        """The URLMatcher built from the currently loaded parsers."""
+        return self._matcher
+    
+    def match_url(self, url):
+        """
+        Find the first parser whose URL pattern matches a URL.
+        
+        Args:
+            url: The URL to match
+            
+        Returns:
+            The matching parser row (id, name, url_pattern, parser), or None
+            if no parser matches
+        """
+        return self._matcher.match(url)
+    
     def rowCount(self, parent=None):
-        return len(self.parsers)
+        return self._row_count
+    
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        """Return True if some loaded parsers have not been shown yet."""
+        if parent.isValid():
+            return False
+        return self._row_count < len(self.parsers)
+    
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """Show the next batch of parsers in the view."""
+        if parent.isValid():
+            return
+        remaining = len(self.parsers) - self._row_count
+        count = min(remaining, self.FETCH_BATCH_SIZE)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._row_count, self._row_count + count - 1)
+        self._row_count += count
+        self.endInsertRows()
     
     def columnCount(self, parent=None):
         return len(self.headers)
     
     def data(self, index, role):
-        if not index.isValid():
+        # The actions column has no data; it is drawn by its delegate
+        values = self._values.get((role, index.column()))
+        if values is None or not index.isValid():
             return None
-            
-        if role == Qt.DisplayRole:
-            parser = self.parsers[index.row()]
-            col = index.column()
-            
-            if col == 0:
-                return str(parser.id)
-            elif col == 1:
-                return parser.name
-            elif col == 2:
-                return parser.url_pattern
-            elif col == 3:
-                return parser.parser
-            elif col == 4:
-                return None  # Actions column handled by delegate
-                
-        return None
+        return values[index.row()]
+    
+    def multiData(self, index, roleDataSpan):
+        """
+        Fill all roles requested for a cell in one call.
+        
+        Item delegates ask for several roles per cell when painting; answering
+        them together saves a C++ to Python call per role.
+        """
+        for role_data in roleDataSpan:
+            value = self.data(index, role_data.role())
+            if value is None:
+                role_data.clearData()
+            else:
+                role_data.setData(value)
     
     def headerData(self, section, orientation, role):
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Spider - URL Matcher
+
+This module provides a matcher that finds the first URL parser whose
+pattern matches a given URL using a single combined regular expression.
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+# Use an Aho-Corasick automaton to find pattern literals when available
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Maximum number of candidate alternations kept per set of patterns
+_MAX_CANDIDATE_ALTERNATIONS = 256
+
+# Numeric backreferences are renumbered when patterns are wrapped in groups,
+# so patterns using them force the per-pattern fallback.
+_NUMERIC_BACKREF = re.compile(r'\\[1-9]')
+
+# A pattern rooted at a literal host: scheme, "://", then a host made only of
+# letters, digits, hyphens and escaped dots, followed by a path slash that is
+# not made optional, or by an end-of-URL anchor. Such a pattern can only match
+# URLs with exactly that netloc; a pattern that simply stops after the host
+# also matches longer hosts (b\.org matches b.org.evil.com) and is not indexed.
+_HOST_ROOTED = re.compile(
+    r'(?P<anchor>\^?)(?:https\?|https|http)(?::\\?/\\?/)'
+    r'(?P<host>(?:[A-Za-z0-9-]|\\\.)+)'
+    r'(?:\\?/(?![?*+{])|\$)'
+)
+
+
+def _literal_host(pattern: str, anchored: bool) -> Optional[str]:
+    """
+    Extract the literal host a URL pattern is rooted at.
+
+    Args:
+        pattern: The URL pattern
+        anchored: Whether the pattern is matched with re.match semantics
+
+    Returns:
+        The host, or None if the pattern may match URLs on other hosts
+    """
+    # Alternation could make the host optional
+    if '|' in pattern:
+        return None
+    m = _HOST_ROOTED.match(pattern)
+    if m is None or not (anchored or m.group('anchor')):
+        return None
+    return m.group('host').replace('\\.', '.')
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """
+    Skip a character class.
+
+    Args:
+        pattern: The regex pattern
+        i: Index of the opening bracket
+
+    Returns:
+        Index just past the closing bracket
+    """
+    i += 1
+    if pattern.startswith('^', i):
+        i += 1
+    if pattern.startswith(']', i):
+        i += 1
+    while i < len(pattern) and pattern[i] != ']':
+        i += 2 if pattern[i] == '\\' else 1
+    return i + 1
+
+
+def _skip_group(pattern: str, i: int) -> int:
+    """
+    Skip a group, including any nested groups and character classes.
+
+    Args:
+        pattern: The regex pattern
+        i: Index of the opening parenthesis
+
+    Returns:
+        Index just past the closing parenthesis
+    """
+    depth = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            i = _skip_class(pattern, i)
+            continue
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _required_literal(rx: re.Pattern) -> Optional[str]:
+    """
+    Extract the longest literal every match of a pattern must contain.
+
+    Only runs of plain characters outside groups and character classes
+    are considered, and a character made optional or repeatable by a
+    quantifier ends the run, so the result is always a substring of the
+    matched text (e.g. "github.com/" for ^https://github\\.com/(\\w+)).
+
+    Args:
+        rx: The compiled pattern
+
+    Returns:
+        The literal, or None if no literal is required
+    """
+    if rx.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+
+    pattern = rx.pattern
+    runs = []
+    run = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if escaped and escaped in 'dDsSwWbBAZ':
+                # Character class or anchor
+                runs.append(''.join(run))
+                run = []
+                continue
+            if not escaped or escaped.isalnum():
+                # Backreferences and character codes are not worth decoding
+                return None
+            c = escaped
+        elif c == '|':
+            # A top-level alternative makes every literal optional
+            return None
+        elif c in '[(.^$*+?{}':
+            runs.append(''.join(run))
+            run = []
+            if c == '[':
+                i = _skip_class(pattern, i)
+            elif c == '(':
+                i = _skip_group(pattern, i)
+            elif c == '{':
+                end = pattern.find('}', i)
+                i = end + 1 if end != -1 else len(pattern)
+            else:
+                i += 1
+            continue
+        else:
+            i += 1
+
+        # A quantified character may be absent or repeated
+        if pattern[i:i + 1] in ('?', '*', '{'):
+            runs.append(''.join(run))
+            run = []
+        elif pattern[i:i + 1] == '+':
+            run.append(c)
+            runs.append(''.join(run))
+            run = []
+        else:
+            run.append(c)
+    runs.append(''.join(run))
+
+    longest = max(runs, key=len)
+    return longest or None
+
+
+class _LiteralIndex:
+    """Find which patterns' required literals occur in a URL."""
+
+    def __init__(self, literals: Dict[int, str]):
+        """
+        Build the index.
+
+        Args:
+            literals: Required literal of each pattern, keyed by pattern index
+        """
+        self.by_literal: Dict[str, List[int]] = {}
+        for i, literal in literals.items():
+            self.by_literal.setdefault(literal, []).append(i)
+
+        self.automaton = None
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for literal, indexes in self.by_literal.items():
+                self.automaton.add_word(literal, indexes)
+            self.automaton.make_automaton()
+
+    def present(self, url: str) -> Set[int]:
+        """
+        Get the patterns whose required literal occurs in a URL.
+
+        Args:
+            url: The URL to scan
+
+        Returns:
+            The indexes of those patterns
+        """
+        found = set()
+        if self.automaton is not None:
+            for _, indexes in self.automaton.iter(url):
+                found.update(indexes)
+        else:
+            for literal, indexes in self.by_literal.items():
+                if literal in url:
+                    found.update(indexes)
+        return found
+
+
+class _Alternation:
+    """Combined alternation of an ordered subset of compiled patterns."""
+
+    def __init__(self, members: List[Tuple[int, re.Pattern]], anchored: bool):
+        """
+        Build the alternation.
+
+        Args:
+            members: (pattern index, compiled pattern) tuples in priority order
+            anchored: Whether patterns must match at the start of the URL
+        """
+        self.members = members
+        # Maps the group number of each alternative to its pattern index
+        self.group_index: Dict[int, int] = {}
+        self.combined = self._build_combined(anchored)
+
+    def _build_combined(self, anchored: bool) -> Optional[re.Pattern]:
+        """
+        Build the combined alternation of the member patterns.
+
+        Args:
+            anchored: Whether patterns must match at the start of the URL
+
+        Returns:
+            The combined pattern, or None if the patterns cannot be combined
+        """
+        if not self.members:
+            return None
+
+        prefix = '' if anchored else '(?s:.*?)'
+        alternatives = []
+        for i, rx in self.members:
+            if _NUMERIC_BACKREF.search(rx.pattern):
+                return None
+            alternatives.append(f"(?P<_p{i}>{prefix}(?:{rx.pattern}))")
+
+        try:
+            combined = re.compile('|'.join(alternatives))
+        except re.error as e:
+            logger.warning(f"Could not combine URL patterns, matching one by one: {str(e)}")
+            return None
+
+        self.group_index = {
+            combined.groupindex[f"_p{i}"]: i for i, _ in self.members
+        }
+        return combined
+
+
+class _CompiledPatterns:
+    """
+    Compiled form of an ordered tuple of URL patterns.
+
+    Instances only depend on the pattern strings, not on the keys they are
+    matched to, so they can be shared between matchers. They are matched
+    against from worker threads: everything is built up front except the
+    cache of narrowed alternations, which is filled with setdefault so that
+    threads racing on the same candidates all use one alternation.
+    """
+
+    def __init__(self, patterns: Tuple[str, ...], anchored: bool):
+        """
+        Compile the patterns.
+
+        Args:
+            patterns: URL patterns in priority order
+            anchored: Whether patterns must match at the start of the URL
+        """
+        self.anchored = anchored
+
+        # (index into patterns, compiled pattern) for every valid pattern
+        self.compiled = []
+        for i, pattern in enumerate(patterns):
+            try:
+                self.compiled.append((i, re.compile(pattern)))
+            except (re.error, TypeError) as e:
+                logger.error(f"Skipping invalid URL pattern {pattern!r}: {str(e)}")
+
+        # Index host-rooted patterns by host; the rest must always be tried
+        self.by_host: Dict[str, List[Tuple[int, re.Pattern]]] = {}
+        self.unindexed: List[Tuple[int, re.Pattern]] = []
+        for i, rx in self.compiled:
+            host = _literal_host(rx.pattern, anchored)
+            if host is None:
+                self.unindexed.append((i, rx))
+            else:
+                self.by_host.setdefault(host, []).append((i, rx))
+
+        # Literals that must occur in a URL for a pattern to match it
+        self.literals: Dict[int, str] = {}
+        for i, rx in self.compiled:
+            literal = _required_literal(rx)
+            if literal is not None:
+                self.literals[i] = literal
+        self.literal_index = _LiteralIndex(self.literals) if self.literals else None
+
+        self.full = _Alternation(self.compiled, anchored)
+
+        # Alternation of the patterns that can match each indexed host, and of
+        # the unindexed patterns alone (under None) for any other host
+        self._host_alternations: Dict[Optional[str], _Alternation] = {}
+        if self.by_host:
+            for host in (None, *self.by_host):
+                members = self.unindexed + self.by_host.get(host, [])
+                members.sort(key=lambda member: member[0])
+                self._host_alternations[host] = _Alternation(members, anchored)
+
+        self._candidate_alternations: Dict[Tuple[int, ...], _Alternation] = {}
+
+    def _host_alternation(self, url: str) -> _Alternation:
+        """
+        Get the alternation of the patterns that can match a URL's host.
+
+        Args:
+            url: The URL to match
+
+        Returns:
+            The alternation of the patterns for the host, in priority order
+        """
+        if not self.by_host:
+            return self.full
+
+        try:
+            host = urlsplit(url).netloc
+        except ValueError:
+            return self.full
+        if host not in self.by_host:
+            host = None
+        return self._host_alternations[host]
+
+    def alternation_for(self, url: str) -> _Alternation:
+        """
+        Get the alternation of the patterns that can match a URL.
+
+        Patterns for other hosts are dropped first, then patterns whose
+        required literal does not occur in the URL.
+
+        Args:
+            url: The URL to match
+
+        Returns:
+            The alternation of the candidate patterns, in priority order
+        """
+        alternation = self._host_alternation(url)
+        if self.literal_index is None:
+            return alternation
+
+        present = self.literal_index.present(url)
+        candidates = tuple(
+            i for i, _ in alternation.members
+            if i not in self.literals or i in present
+        )
+        if len(candidates) == len(alternation.members):
+            return alternation
+
+        narrowed = self._candidate_alternations.get(candidates)
+        if narrowed is None:
+            if len(self._candidate_alternations) >= _MAX_CANDIDATE_ALTERNATIONS:
+                self._candidate_alternations.clear()
+            members = [
+                member for member in alternation.members if member[0] in candidates
+            ]
+            narrowed = self._candidate_alternations.setdefault(
+                candidates, _Alternation(members, self.anchored)
+            )
+        return narrowed
+
+
+@lru_cache(maxsize=16)
+def _compile_patterns(patterns: Tuple[str, ...], anchored: bool) -> _CompiledPatterns:
+    """
+    Compile a tuple of URL patterns, reusing the result for identical tuples.
+
+    Rebuilding a matcher after an edit that does not touch any URL pattern
+    (renaming a parser, for example) then costs no regex compilation.
+
+    Args:
+        patterns: URL patterns in priority order
+        anchored: Whether patterns must match at the start of the URL
+
+    Returns:
+        The compiled patterns
+    """
+    return _CompiledPatterns(patterns, anchored)
+
+
+class URLMatcher:
+    """
+    Match URLs against an ordered list of URL patterns.
+
+    Patterns rooted at a literal host (e.g. ^https://github\\.com/...) are
+    indexed by that host, so only the patterns for the URL's host and the
+    patterns without a literal host are candidates for a given URL. Patterns
+    are further narrowed to those whose required literal substring (found
+    with an Aho-Corasick automaton when pyahocorasick is installed) occurs
+    in the URL. The candidates are combined into one alternation of named groups, one group
+    per pattern, and the group that matched identifies the pattern.
+    Alternatives are tried in order, so the result is the same as testing
+    each pattern in turn and returning the first one that matches.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[Any, str]], anchored: bool = False):
+        """
+        Initialize the URLMatcher.
+
+        Args:
+            patterns: Iterable of (key, pattern) tuples, in priority order
+            anchored: If True, patterns must match at the start of the URL
+                (re.match semantics); otherwise they may match anywhere
+                (re.search semantics)
+        """
+        self.anchored = anchored
+        items = list(patterns)
+        self._keys = [key for key, _ in items]
+        self._patterns = _compile_patterns(tuple(pattern for _, pattern in items), anchored)
+
+    def __len__(self) -> int:
+        return len(self._patterns.compiled)
+
+    def match(self, url: str) -> Optional[Any]:
+        """
+        Find the first pattern that matches a URL.
+
+        Args:
+            url: The URL to match
+
+        Returns:
+            The key of the first matching pattern, or None if none match
+        """
+        alternation = self._patterns.alternation_for(url)
+        if alternation.combined is not None:
+            m = alternation.combined.match(url)
+            return self._keys[alternation.group_index[m.lastindex]] if m else None
+
+        for i, rx in alternation.members:
+            if (rx.match(url) if self.anchored else rx.search(url)):
+                return self._keys[i]
+        return None